@@ -72,6 +72,7 @@ if config is None:
     }
 
 선거리스트 = config['elections']
+os.environ.setdefault('GINI_BACKEND', str(config.get('gini_backend', 'auto')))
 
 election_dates = {
     '18대_국회의원': '080409',
@@ -14,6 +14,7 @@ with open(config_path, 'r', encoding="utf-8") as file:
     config = yaml.safe_load(file)
 
 db_path = config['db_path']
+os.environ.setdefault('GINI_BACKEND', str(config.get('gini_backend', 'auto')))
 선거리스트 = config['elections']
 
 if __name__ == "__main__":
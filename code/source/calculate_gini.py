@@ -1,31 +1,274 @@
 import numpy as np
-import PublicDataReader as pdr
+import pandas as pd
 import logging
+from source import gini_sketch, rolling_gini, gini_bootstrap, gini_backends, code_tables
+
+
+def _sort_segments(codes, values, n_groups, weights=None, order=None):
+    """
+    (컬럼, 그룹코드)를 구간 키로 묶어 (구간 키, 값) 순서로 한 번 정렬하는 함수
+
+    값 컬럼이 여러 개면 컬럼 번호를 구간 키에 포함해 같은 정렬에서 함께 처리한다.
+    음수 값이 있는 구간은 최솟값만큼 이동하고 0 방지값을 더한다 (GiniCalculator.gini와 동일).
+    order가 주어지면 정렬 대신 그 순서를 사용한다 (여러 그룹 단위가 값 정렬을 공유할 때).
+
+    Returns:
+        tuple: keys, vals, weights, counts, starts (정렬된 배열과 구간별 건수/시작 위치)
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_cols = values.shape[1]
+
+    # (컬럼, 그룹코드)를 하나의 구간 키로 결합
+    valid = codes >= 0
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        if (weights < 0).any():
+            raise ValueError("가중치는 음수일 수 없습니다")
+        valid &= ~np.isnan(weights)
+    keys = (codes[valid][None, :] + n_groups * np.arange(n_cols)[:, None]).ravel()
+    vals = values[valid].T.ravel()
+    n_segments = n_groups * n_cols
+
+    # 구간 키, 값 순서로 한 번만 정렬 (NaN은 구간의 마지막으로)
+    if order is None:
+        order = np.lexsort((vals, keys))
+    keys = keys[order]
+    vals = vals[order]
+    if weights is not None:
+        weights = np.tile(weights[valid], n_cols)[order]
+
+    counts = np.bincount(keys, minlength=n_segments)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # 음수 값은 구간 최솟값만큼 이동 + 0 방지 (정렬되어 있으므로 첫 값이 최솟값)
+    seg_min = np.zeros(n_segments)
+    nonempty = counts > 0
+    seg_min[nonempty] = vals[starts[nonempty]]
+    shift = np.where(seg_min < 0, -seg_min, 0.0)
+    vals = vals + shift[keys] + 0.0000001
+    return keys, vals, weights, counts, starts
+
+
+def _reshape_segments(result, n_groups, single):
+    # 구간별 결과 (컬럼 수 * n_groups,) -> (n_groups,) 또는 (n_groups, 컬럼 수)
+    result = result.reshape(-1, n_groups).T
+    return result[:, 0] if single else result
+
+
+def grouped_gini(codes, values, n_groups, weights=None, order=None, backend=None):
+    """
+    그룹별 지니계수를 한 번의 정렬로 계산하는 함수
+
+    (그룹코드, 값) 기준으로 한 번만 정렬한 뒤 구간(segment)별 합으로 모든 그룹의
+    지니계수를 구한다. 값 컬럼이 여러 개면 (컬럼, 그룹코드)를 하나의 키로 묶어
+    같은 정렬에서 함께 계산한다. 그룹별 결과는 GiniCalculator.gini와 동일하다.
+    weights가 주어지면 같은 정렬 위에서 가중 지니계수를 계산한다.
+
+    Parameters:
+        codes (np.ndarray): 행별 그룹코드 (0 ~ n_groups-1, 음수는 계산에서 제외)
+        values (np.ndarray): 값 배열 (행 수) 또는 (행 수, 컬럼 수)
+        n_groups (int): 그룹 수
+        weights (np.ndarray): 행별 가중치 (선택, 0 이상, 결측 행은 계산에서 제외)
+        order (np.ndarray): (그룹코드, 값) 정렬 순서 (선택, 이미 계산된 경우)
+        backend (str): 계산 백엔드 이름 (기본값은 GINI_BACKEND 설정, gini_backends 참조)
+
+    Returns:
+        np.ndarray: 지니계수 배열 (n_groups,) 또는 (n_groups, 컬럼 수)
+    """
+    single = np.ndim(values) == 1
+    keys, vals, weights, counts, starts = _sort_segments(codes, values, n_groups, weights, order)
+    backend = gini_backends.get_backend(backend)
+    if weights is not None:
+        result = backend.segment_weighted_gini(keys, vals, weights, counts, starts)
+    else:
+        result = backend.segment_gini(keys, vals, counts, starts)
+
+    return _reshape_segments(result, n_groups, single)
+
+
+def grouped_inequality(codes, values, n_groups, atkinson_eps=(0.5, 1.0, 2.0)):
+    """
+    그룹별 불평등 지표를 한 번의 정렬과 누적합으로 계산하는 함수
+
+    지니계수, 타일 T/L, 앳킨슨(ε), 팔마비율, P90/P10, P80/P20, 상위 10% 점유율을
+    grouped_gini와 같은 정렬/구간 위에서 구간별 합과 누적합만으로 계산한다.
+    분위수는 np.quantile 기본(선형 보간)과 같고, 점유율은 로렌츠 곡선을 선형 보간한다.
+
+    Parameters:
+        codes (np.ndarray): 행별 그룹코드 (0 ~ n_groups-1, 음수는 계산에서 제외)
+        values (np.ndarray): 값 배열 (행 수) 또는 (행 수, 컬럼 수)
+        n_groups (int): 그룹 수
+        atkinson_eps (tuple): 앳킨슨 지수의 불평등 회피 계수 ε 목록
+
+    Returns:
+        dict: 지표명 -> (n_groups,) 또는 (n_groups, 컬럼 수) 배열
+    """
+    single = np.ndim(values) == 1
+    keys, vals, _, counts, starts = _sort_segments(codes, values, n_groups)
+    n_segments = counts.shape[0]
+    n = counts.astype(float)
+    nonempty = counts > 0
+
+    def seg_sum(x):
+        return np.bincount(keys, weights=x, minlength=n_segments)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        index = np.arange(vals.shape[0]) - starts[keys] + 1
+        total = seg_sum(vals)
+        mean = total / n
+        log_vals = np.log(vals)
+        mean_log = seg_sum(log_vals) / n
+
+        result = {
+            '지니계수': seg_sum((2 * index - counts[keys] - 1) * vals) / (n * total),
+            '타일T': seg_sum(vals * log_vals) / total - np.log(mean),
+            '타일L': np.log(mean) - mean_log,
+        }
+        for eps in atkinson_eps:
+            if eps == 1:
+                result[f'앳킨슨_{eps:g}'] = 1 - np.exp(mean_log) / mean
+            else:
+                ede = (seg_sum(vals ** (1 - eps)) / n) ** (1 / (1 - eps))
+                result[f'앳킨슨_{eps:g}'] = 1 - ede / mean
+
+        # 구간 내 분위수 (np.quantile 선형 보간)
+        def quantile(p):
+            h = (n - 1) * p
+            lo = np.floor(h).astype(np.int64)
+            hi = np.minimum(lo + 1, counts - 1)
+            lo_val = np.full(n_segments, np.nan)
+            hi_val = np.full(n_segments, np.nan)
+            lo_val[nonempty] = vals[starts[nonempty] + lo[nonempty]]
+            hi_val[nonempty] = vals[starts[nonempty] + hi[nonempty]]
+            return lo_val + (h - lo) * (hi_val - lo_val)
+
+        # 로렌츠 곡선 L(p): 하위 p 비율 거래가 차지하는 금액 비중 (누적합 공유)
+        cum = np.concatenate(([0.0], np.cumsum(vals)))
+
+        def lorenz(p):
+            k = np.floor(n * p).astype(np.int64)
+            frac = n * p - k
+            below = np.full(n_segments, np.nan)
+            below[nonempty] = cum[starts[nonempty] + k[nonempty]] - cum[starts[nonempty]]
+            partial = np.zeros(n_segments)
+            inside = nonempty & (k < counts)
+            partial[inside] = frac[inside] * vals[starts[inside] + k[inside]]
+            return (below + partial) / total
+
+        top10 = 1 - lorenz(0.9)
+        result['팔마비율'] = top10 / lorenz(0.4)
+        result['P90_P10'] = quantile(0.9) / quantile(0.1)
+        result['P80_P20'] = quantile(0.8) / quantile(0.2)
+        result['상위10%_점유율'] = top10
+
+    return {name: _reshape_segments(arr, n_groups, single) for name, arr in result.items()}
+
+
+def combine_labels(frame, cols, sep='_', strip=False):
+    """
+    여러 문자열 컬럼을 결합한 지역 라벨을 범주형(정수 코드 + 라벨 사전)으로 만드는 함수
+
+    행마다 문자열을 이어 붙이지 않고 컬럼별 정수 코드를 하나의 키로 합친 뒤, 고유한 조합에서만
+    라벨을 만든다. 라벨은 정렬된 범주로 저장되어 groupby 결과 순서가 문자열 컬럼과 같다.
+    한 컬럼이라도 결측이면 결측 (문자열 + 연산과 동일), strip=True면 결측을 ''로 보고
+    결합 후 앞뒤 구분자를 제거한다.
+    """
+    key = np.zeros(len(frame), dtype=np.int64)
+    missing = np.zeros(len(frame), dtype=bool)
+    uniques = []
+    for col in cols:
+        values = frame[col]
+        if strip:
+            values = values.astype(object).fillna('')
+        codes, col_uniques = pd.factorize(values)
+        missing |= codes < 0
+        key = key * (len(col_uniques) + 1) + (codes + 1)
+        uniques.append(pd.Index(col_uniques).astype(str))
+
+    # 고유 조합을 컬럼별 위치로 되돌려 라벨 생성
+    key_codes, key_uniques = pd.factorize(key)
+    labels = None
+    remainder = np.asarray(key_uniques)
+    for col_uniques in reversed(uniques):
+        position = remainder % (len(col_uniques) + 1) - 1
+        remainder = remainder // (len(col_uniques) + 1)
+        part = pd.Series(col_uniques.take(np.maximum(position, 0)))
+        labels = part if labels is None else part + sep + labels
+    if strip:
+        labels = labels.str.strip(sep)
+
+    # 고유 조합 라벨 -> 정렬된 범주 코드 (결측은 -1)
+    label_cat = pd.Categorical(labels)
+    codes = label_cat.codes[key_codes]
+    codes[missing] = -1
+    return pd.Categorical.from_codes(codes, categories=label_cat.categories)
+
+
+def decode_labels(frame):
+    """
+    결과 표의 범주형 지역 컬럼을 라벨 값으로 변환 (최종 결과에만 라벨을 붙임)
+    """
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype(frame[col].cat.categories.dtype)
+    return frame
+
 
 class GiniCalculator:
     def __init__(self, data):
         self.data = data
         logging.basicConfig(level=logging.INFO)
 
-    def gini(self, array):
-        array = array.flatten().astype(float)  # 1차원 배열로 만들기 + 실수형으로
-        if np.amin(array) < 0:
-            array -= np.amin(array)  # 음수 값은 불가
-        array += 0.0000001  # 0 방지
-        array = np.sort(array)  # 거래 값을 정렬
-        index = np.arange(1, array.shape[0] + 1)  # 각 배열에 인덱스 부여
-        n = array.shape[0]
-        return ((np.sum((2 * index - n - 1) * array)) / (n * np.sum(array)))
-
-    def calculate_gini_per_group(self, group_cols, value_col):
-        grouped = self.data.groupby(group_cols)
-        gini_results = grouped[value_col].apply(lambda x: self.gini(x.values)).reset_index()
-        gini_results.columns = group_cols + ['지니계수']
+    def gini(self, array, weights=None):
+        if weights is not None:  # 가중 지니계수는 그룹 커널을 단일 그룹으로 사용
+            array = np.asarray(array, dtype=float).flatten()
+            return grouped_gini(np.zeros(array.shape[0], dtype=np.int64), array, 1, weights=np.asarray(weights).flatten())[0]
+        return gini_backends.get_backend().gini(array)
+
+    def group_codes(self, group_cols):
+        """
+        그룹 컬럼을 정수 그룹코드로 변환 (groupby 결과 순서와 동일, 결측 그룹은 -1)
+        범주형 컬럼은 정수 코드로 그룹화하고 관측된 범주만 사용한다.
+        """
+        grouped = self.data.groupby(group_cols, observed=True)
+        codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        return grouped, codes
+
+    def weights(self, weight_col):
+        """
+        가중치 컬럼을 실수 배열로 변환 (없으면 None)
+        """
+        if weight_col is None:
+            return None
+        return pd.to_numeric(self.data[weight_col], errors='coerce').to_numpy(dtype=float)
+
+    def calculate_gini_per_group(self, group_cols, value_col, weight_col=None):
+        grouped, codes = self.group_codes(group_cols)
+        values = pd.to_numeric(self.data[value_col], errors='coerce').to_numpy(dtype=float)
+        gini_results = decode_labels(grouped.size().reset_index().iloc[:, :len(group_cols)])
+        gini_results['지니계수'] = grouped_gini(codes, values, grouped.ngroups, weights=self.weights(weight_col))
         return gini_results
     
-    def calculate_stats(self, region_col):
+    def calculate_stats(self, region_col, weight_col=None, n_boot=0, ci_level=0.95, seed=None, n_jobs=None):
+        """
+        지역별 거래수, 평균거래금액, 지니계수 계산
+
+        Parameters:
+            region_col (str | list): 지역 컬럼
+            weight_col (str): 가중치 컬럼 (예: '전용면적', 표본가중치). 주어지면 지니계수는 가중 지니계수
+            n_boot (int): 부트스트랩 복제 수 (0이면 신뢰구간 미계산)
+            ci_level (float): 신뢰수준
+            seed (int): 부트스트랩 난수 시드
+            n_jobs (int): 부트스트랩 프로세스 수
+
+        Returns:
+            dict: row_count, grouped(지역별 결과)
+        """
         try:
-            logging.info(f"지니계수 계산 시작 - 지역 단위: {region_col}")
+            logging.info(f"지니계수 계산 시작 - 지역 단위: {region_col}, 가중치: {weight_col}")
             self.data['년도'] = self.data['거래일자'].dt.year
 
             if isinstance(region_col, str):
@@ -34,30 +277,48 @@ class GiniCalculator:
                 group_cols = region_col
 
             # 데이터 그룹화 전 region_col 존재 여부 확인
-            if region_col not in self.data.columns:
-                logging.error(f"컬럼을 찾을 수 없음: {region_col}")
+            missing_cols = [col for col in group_cols + ([weight_col] if weight_col else []) if col not in self.data.columns]
+            if missing_cols:
+                logging.error(f"컬럼을 찾을 수 없음: {missing_cols}")
                 return None
 
-            grouped = self.data.groupby(group_cols).agg(
+            # 거래수/평균은 pandas 집계, 지니계수는 한 번의 정렬로 두 컬럼을 함께 계산
+            groupby, codes = self.group_codes(group_cols)
+            grouped = groupby.agg(
                 거래수=('거래금액', 'count'),
                 평균거래금액=('거래금액', 'mean'),
-                지니계수=('거래금액', lambda x: self.gini(x.values)),
-                평당_평균거래금액=('평당거래금액', 'mean'),
-                평당_지니계수=('평당거래금액', lambda x: self.gini(x.values))
+                평당_평균거래금액=('평당거래금액', 'mean')
             ).reset_index()
+            grouped = decode_labels(grouped)
+            values = self.data[['거래금액', '평당거래금액']].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+            gini_values = grouped_gini(codes, values, groupby.ngroups, weights=self.weights(weight_col))
+            grouped.insert(grouped.columns.get_loc('평균거래금액') + 1, '지니계수', gini_values[:, 0])
+            grouped['평당_지니계수'] = gini_values[:, 1]
+
+            # 지니계수 부트스트랩 신뢰구간 (백분위, BCa)
+            if n_boot > 0:
+                if weight_col is not None:
+                    raise ValueError("부트스트랩 신뢰구간은 비가중 지니계수에서만 지원합니다")
+                ci = gini_bootstrap.bootstrap_ci(codes, values, groupby.ngroups, n_boot=n_boot,
+                                                 level=ci_level, seed=seed, n_jobs=n_jobs)
+                for i, name in enumerate(['지니계수', '평당_지니계수']):
+                    grouped[f'{name}_하한'] = ci[:, i, 0]
+                    grouped[f'{name}_상한'] = ci[:, i, 1]
+                    grouped[f'{name}_BCa_하한'] = ci[:, i, 2]
+                    grouped[f'{name}_BCa_상한'] = ci[:, i, 3]
 
             logging.info(f"그룹화된 데이터 형태: {grouped.shape}")
             result_num = grouped['거래수'].sum()
 
             # 법정동코드 별 지니계수 
             if region_col == '법정동코드':
-                code_bdong = pdr.code_bdong()
+                code_bdong = code_tables.code_bdong()
                 code_bdong.rename(columns={'읍면동명': '법정동명'}, inplace=True)
                 grouped = code_bdong[["시도명", "시군구명", "법정동명", "법정동코드"]].merge(grouped, on='법정동코드', how='right')
                 grouped.to_csv(f"data/processed/{region_col}_지니계수.csv")
             # 행정동코드 별 지니계수
             elif region_col == '행정동코드':
-                code_hdong = pdr.code_hdong()
+                code_hdong = code_tables.code_hdong()
                 code_hdong.rename(columns={'읍면동명': '행정동명'}, inplace=True)
                 grouped = code_hdong[["시도명", "시군구명", "행정동명", "행정동코드"]].merge(grouped, on='행정동코드', how='right')
                 grouped.to_csv(f"data/processed/{region_col}_지니계수.csv")
@@ -74,6 +335,151 @@ class GiniCalculator:
             logging.error(f"지니계수 계산 중 오류 발생: {str(e)}")
             raise
 
+    def calculate_stats_approx(self, region_col, relative_accuracy=0.005, sketches=None):
+        """
+        분위수 스케치 기반 근사 지니계수 계산
+
+        거래금액/평당거래금액을 지역별 GiniSketch로 요약해 지니계수와 오차한계를 구한다.
+        sketches로 이전 청크/기간의 스케치를 넘기면 병합해서 계산하므로
+        전체 거래 이력을 메모리에 올리지 않고도 긴 기간을 처리할 수 있다.
+
+        Parameters:
+            region_col (str): 지역 컬럼
+            relative_accuracy (float): 버킷 상대오차
+            sketches (dict): {'거래금액': GiniSketch, '평당거래금액': GiniSketch} (선택)
+
+        Returns:
+            dict: row_count, grouped(지역별 근사 지니계수), sketches(병합된 스케치)
+        """
+        logging.info(f"근사 지니계수 계산 시작 - 지역 단위: {region_col}, 상대오차: {relative_accuracy}")
+        merged = {}
+        for value_col in ['거래금액', '평당거래금액']:
+            sketch = gini_sketch.GiniSketch(relative_accuracy)
+            if self.data is not None and len(self.data) > 0:
+                sketch.update(self.data[region_col], self.data[value_col])
+            if sketches is not None and value_col in sketches:
+                sketch.merge(sketches[value_col])
+            merged[value_col] = sketch
+
+        sale = merged['거래금액'].gini().rename(columns={'지역': region_col, '오차한계': '지니계수_오차한계'})
+        per_area = merged['평당거래금액'].gini().rename(columns={
+            '지역': region_col, '지니계수': '평당_지니계수', '오차한계': '평당_지니계수_오차한계'})
+        grouped = sale.merge(per_area.drop(columns=['거래수']), on=region_col, how='outer')
+
+        logging.info(f"근사 지니계수 계산 완료: {grouped.shape}")
+        return {'row_count': grouped['거래수'].sum(), 'grouped': grouped, 'sketches': merged}
+
+    def calculate_rolling(self, region_col, value_col='거래금액', window_days=365, freq='D',
+                          start_date=None, end_date=None):
+        """
+        지역별 '최근 window_days일' 지니계수 시계열 (rolling_gini.rolling_gini 참조)
+        """
+        return rolling_gini.rolling_gini(self.data, region_col, value_col, window_days=window_days,
+                                         freq=freq, start_date=start_date, end_date=end_date)
+
+    def calculate_inequality(self, region_col, value_cols='거래금액', atkinson_eps=(0.5, 1.0, 2.0)):
+        """
+        지역별 불평등 지표 패널 계산 (지니계수, 타일 T/L, 앳킨슨, 팔마비율, 분위수 비율, 상위 10% 점유율)
+
+        Parameters:
+            region_col (str | list): 지역 컬럼
+            value_cols (str | list): 값 컬럼. 여러 개면 지표명 앞에 '{컬럼}_'를 붙임
+            atkinson_eps (tuple): 앳킨슨 지수의 ε 목록
+
+        Returns:
+            pd.DataFrame: 지역별 거래수와 불평등 지표
+        """
+        group_cols = [region_col] if isinstance(region_col, str) else list(region_col)
+        value_cols = [value_cols] if isinstance(value_cols, str) else list(value_cols)
+        logging.info(f"불평등 지표 계산 시작 - 지역 단위: {region_col}, 값: {value_cols}")
+
+        groupby, codes = self.group_codes(group_cols)
+        panel = decode_labels(groupby.size().rename('거래수').reset_index())
+        values = self.data[value_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        indices = grouped_inequality(codes, values, groupby.ngroups, atkinson_eps=atkinson_eps)
+        for i, value_col in enumerate(value_cols):
+            prefix = f'{value_col}_' if len(value_cols) > 1 else ''
+            for name, arr in indices.items():
+                panel[prefix + name] = arr[:, i]
+
+        logging.info(f"불평등 지표 계산 완료: {panel.shape}")
+        return panel
+
+    def decompose(self, levels=('시도명', '시도_시군구', '시도_시군구_읍면동'), value_col='거래금액'):
+        """
+        전국 -> 시도 -> 시군구 -> 읍면동 계층별 지니계수 분해
+
+        각 상위 지역의 지니계수를 하위 지역 기준으로
+        G = 집단내(sum p_c * s_c * G_c) + 집단간(하위 지역 평균의 거래수 가중 지니계수) + 중첩(나머지)
+        으로 나눈다 (p_c: 거래수 비중, s_c: 금액 비중). 값 정렬은 한 번만 하고
+        각 계층은 그룹코드 기준 안정 정렬로 같은 값 순서를 공유한다.
+
+        Parameters:
+            levels (tuple): 상위에서 하위 순서의 지역 컬럼 (전국은 자동 추가)
+            value_col (str): 값 컬럼 (음수 불가)
+
+        Returns:
+            pd.DataFrame: 상위단위, 상위지역, 하위단위, 하위지역수, 거래수, 지니계수, 집단내, 집단간, 중첩
+        """
+        levels = list(levels)
+        logging.info(f"지니계수 계층 분해 시작 - 계층: {levels}, 값: {value_col}")
+        values = pd.to_numeric(self.data[value_col], errors='coerce').to_numpy(dtype=float)
+        if (values < 0).any():
+            raise ValueError(f"지니계수 분해는 음수 값을 지원하지 않습니다: {value_col}")
+
+        # 계층별 그룹코드 (하위 계층은 상위 컬럼을 모두 포함해 항상 상위에 포함됨)
+        level_codes, level_labels = [np.zeros(len(self.data), dtype=np.int64)], [np.array(['전국'])]
+        for k in range(len(levels)):
+            groupby, codes = self.group_codes(levels[:k + 1])
+            level_codes.append(codes)
+            level_labels.append(groupby.size().reset_index()[levels[k]].to_numpy())
+        valid = ~np.isnan(values)
+        for codes in level_codes:
+            valid &= codes >= 0
+        values = values[valid] + 0.0000001
+        level_codes = [codes[valid] for codes in level_codes]
+        level_names = ['전국'] + levels
+
+        # 값 정렬은 한 번, 계층별로는 그룹코드 안정 정렬만 수행
+        value_order = np.argsort(values, kind='stable')
+        stats = []
+        for codes, labels in zip(level_codes, level_labels):
+            n_groups = len(labels)
+            order = value_order[np.argsort(codes[value_order], kind='stable')]
+            count = np.bincount(codes, minlength=n_groups).astype(float)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = np.bincount(codes, weights=values, minlength=n_groups) / count
+            stats.append({'codes': codes, 'n': count, 'mean': mean,
+                          'gini': grouped_gini(codes, values, n_groups, order=order)})
+
+        frames = []
+        for k in range(len(levels)):
+            parent, child = stats[k], stats[k + 1]
+            n_parents = len(level_labels[k])
+            parent_of = np.zeros(len(level_labels[k + 1]), dtype=np.int64)
+            parent_of[child['codes']] = parent['codes']
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                share = (child['n'] / parent['n'][parent_of]) * \
+                        (child['n'] * child['mean'] / (parent['n'][parent_of] * parent['mean'][parent_of]))
+                within = np.bincount(parent_of, weights=np.nan_to_num(share * child['gini']), minlength=n_parents)
+            between = grouped_gini(parent_of, child['mean'], n_parents, weights=child['n'])
+            frames.append(pd.DataFrame({
+                '상위단위': level_names[k],
+                '상위지역': level_labels[k],
+                '하위단위': level_names[k + 1],
+                '하위지역수': np.bincount(parent_of, minlength=n_parents),
+                '거래수': parent['n'].astype(np.int64),
+                '지니계수': parent['gini'],
+                '집단내': within,
+                '집단간': between,
+                '중첩': parent['gini'] - within - between,
+            }))
+
+        result = pd.concat(frames, ignore_index=True)
+        logging.info(f"지니계수 계층 분해 완료: {result.shape}")
+        return result
+
 # test = np.array([0, 0, 0, 0, 0, 0, 0, 0, 0, 100])
 # calculator = GiniCalculator(test)
 # calculator.gini(test)
@@ -0,0 +1,217 @@
+import os
+import glob
+import json
+import hashlib
+import logging
+import datetime
+import threading
+
+import pandas as pd
+
+# PublicDataReader 코드표 스냅샷 ({이름}.v{버전}.parquet + manifest.json)
+# 스냅샷은 저장소에 포함되지 않으므로 네트워크가 되는 환경에서 한 번 만들어 둔다:
+#   cd code && python -m source.code_tables   (또는 code_tables.refresh_snapshots())
+# 만든 디렉터리(data/mapping/code_tables)를 오프라인 환경에 복사하면 네트워크 없이 동작한다.
+SNAPSHOT_DIR = 'data/mapping/code_tables'
+SNAPSHOT_VERSION = 1
+
+# 이름 -> PublicDataReader 함수명
+SOURCES = {
+    'bdong': 'code_bdong',
+    'hdong': 'code_hdong',
+    'hdong_bdong': 'code_hdong_bdong',
+}
+
+# 자릿수를 맞출 코드 컬럼
+CODE_WIDTHS = {'시도코드': 2, '시군구코드': 5, '법정동코드': 10, '행정동코드': 10}
+DATE_COLS = ['생성일자', '말소일자']
+
+_cache = {}  # (스냅샷 디렉터리, 이름) -> 정규화된 코드표
+_cache_lock = threading.Lock()
+
+
+def normalize(df):
+    """
+    코드표 dtype 정리: 컬럼명 공백 제거, 코드는 0으로 자릿수를 채운 문자열, 생성/말소일자는 날짜 (없으면 NaT)
+    """
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    for col, width in CODE_WIDTHS.items():
+        if col in df.columns:
+            codes = df[col].where(df[col].notna(), '').astype(str).str.strip()
+            # 숫자로 읽힌 코드의 '.0' 제거
+            codes = codes.str.replace(r'\.0$', '', regex=True)
+            df[col] = codes.str.zfill(width).where(codes != '', None)
+    for col in DATE_COLS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col].astype(str), format='%Y%m%d', errors='coerce')
+    return df
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def manifest_path(snapshot_dir):
+    return os.path.join(snapshot_dir, 'manifest.json')
+
+
+def read_manifest(snapshot_dir):
+    path = manifest_path(snapshot_dir)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def snapshot_file(name):
+    return f"{name}.v{SNAPSHOT_VERSION}.parquet"
+
+
+def read_snapshot(name, snapshot_dir):
+    """
+    스냅샷을 읽는 함수 (매니페스트의 버전과 sha256이 파일과 같을 때만, 아니면 None)
+    """
+    entry = read_manifest(snapshot_dir).get(name)
+    if entry is None or entry.get('version') != SNAPSHOT_VERSION:
+        return None
+    path = os.path.join(snapshot_dir, entry['file'])
+    if not os.path.exists(path):
+        return None
+    if file_sha256(path) != entry['sha256']:
+        logging.warning(f"코드표 스냅샷 해시 불일치, 무시함: {path}")
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except Exception as e:
+        logging.warning(f"코드표 스냅샷을 읽을 수 없음 ({e}): {path}")
+        return None
+    logging.info(f"코드표 스냅샷 로드: {path} ({entry['fetched_at']} 수집, {len(df)}행)")
+    return df
+
+
+def read_stale_snapshot(name, snapshot_dir):
+    """
+    버전/해시와 관계없이 남아 있는 스냅샷 중 가장 최신 버전을 읽는 함수 (다운로드 실패 시 대체용, 없으면 None)
+    """
+    def version(path):
+        suffix = os.path.basename(path)[len(name) + 2:-len('.parquet')]
+        return int(suffix) if suffix.isdigit() else -1
+
+    for path in sorted(glob.glob(os.path.join(glob.escape(snapshot_dir), f"{name}.v*.parquet")), key=version, reverse=True):
+        try:
+            df = normalize(pd.read_parquet(path))
+        except Exception as e:
+            logging.warning(f"코드표 스냅샷을 읽을 수 없음 ({e}): {path}")
+            continue
+        logging.warning(f"오래되었거나 검증되지 않은 코드표 스냅샷을 대신 사용: {path} ({len(df)}행)")
+        return df
+    return None
+
+
+def write_snapshot(name, df, snapshot_dir):
+    """
+    코드표를 Parquet 스냅샷으로 저장하고 매니페스트(파일, sha256, 행 수, 수집 시각, 버전)를 갱신하는 함수
+    """
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        path = os.path.join(snapshot_dir, snapshot_file(name))
+        df.to_parquet(path, index=False)
+        manifest = read_manifest(snapshot_dir)
+        manifest[name] = {
+            'file': snapshot_file(name),
+            'sha256': file_sha256(path),
+            'rows': len(df),
+            'fetched_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'version': SNAPSHOT_VERSION,
+        }
+        tmp_path = manifest_path(snapshot_dir) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, manifest_path(snapshot_dir))
+        logging.info(f"코드표 스냅샷 저장: {path}")
+    except (OSError, ImportError) as e:
+        logging.warning(f"코드표 스냅샷을 저장할 수 없음: {e}")
+
+
+def fetch_table(name):
+    """
+    PublicDataReader에서 코드표를 받아 정규화하는 함수 (네트워크 필요)
+    """
+    import PublicDataReader as pdr
+
+    logging.info(f"코드표 다운로드: {SOURCES[name]}")
+    return normalize(getattr(pdr, SOURCES[name])())
+
+
+def get_table(name, snapshot_dir=SNAPSHOT_DIR, refresh=False):
+    """
+    코드표를 불러오는 함수 (프로세스 안에서 한 번만 로드)
+
+    1) 메모리 캐시
+    2) 로컬 스냅샷 (매니페스트의 sha256/버전 확인, 네트워크 불필요)
+    3) 둘 다 없거나 refresh=True면 PublicDataReader에서 받아 스냅샷으로 저장
+    4) 다운로드에 실패하면 버전/해시가 맞지 않는 스냅샷이라도 경고와 함께 사용 (없으면 예외)
+
+    반환값은 캐시의 복사본이므로 호출한 쪽에서 수정해도 된다.
+
+    Parameters:
+        name (str): 'bdong', 'hdong', 'hdong_bdong'
+    """
+    if name not in SOURCES:
+        raise ValueError(f"알 수 없는 코드표: {name}")
+    key = (os.path.abspath(snapshot_dir), name)
+    with _cache_lock:
+        table = None if refresh else _cache.get(key)
+        if table is None and not refresh:
+            table = read_snapshot(name, snapshot_dir)
+        if table is None:
+            try:
+                table = fetch_table(name)
+            except Exception as e:
+                logging.warning(f"코드표 다운로드 실패 ({e}): {name}")
+                table = read_stale_snapshot(name, snapshot_dir)
+                if table is None:
+                    raise
+            else:
+                write_snapshot(name, table, snapshot_dir)
+        _cache[key] = table
+        return table.copy()
+
+
+def code_bdong():
+    """
+    법정동 코드표 (pdr.code_bdong, 시군구코드/법정동코드 자릿수 정리, 생성/말소일자 날짜 변환)
+    """
+    return get_table('bdong')
+
+
+def code_hdong():
+    """
+    행정동 코드표 (pdr.code_hdong, 시군구코드/행정동코드 자릿수 정리, 생성/말소일자 날짜 변환)
+    """
+    return get_table('hdong')
+
+
+def code_hdong_bdong():
+    """
+    행정동-법정동 연결 코드표 (pdr.code_hdong_bdong, 코드 자릿수 정리, 생성/말소일자 날짜 변환)
+    """
+    return get_table('hdong_bdong')
+
+
+def refresh_snapshots(names=tuple(SOURCES), snapshot_dir=SNAPSHOT_DIR):
+    """
+    코드표를 다시 받아 스냅샷을 갱신하는 함수 (네트워크 필요)
+    """
+    for name in names:
+        get_table(name, snapshot_dir, refresh=True)
+
+
+# 사용 예시
+if __name__ == "__main__":
+    refresh_snapshots()
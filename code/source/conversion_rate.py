@@ -0,0 +1,122 @@
+import os
+import hashlib
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+# 지역별 전월세 전환율 원본 (KOSIS, 열: 주택유형별(1), 지역별(1), 2011.01, 2011.02, ...)
+RATE_CSV = 'data/mapping/지역별_전월셰_전환율_2011_2025.csv'
+NATIONAL = '전국'
+CACHE_VERSION = 1
+
+_cache = {}  # (CSV 절대경로, 주택유형) -> (파일 상태, RateTable)
+_cache_lock = threading.Lock()
+
+
+class RateTable:
+    """
+    (지역 x 연월) 전환율 배열
+
+    결측은 지역마다 시간순으로 앞/뒤 값으로 채워져 있다. lookup은 (지역키, 연월)로
+    한 번에 조회하고, 값이 없으면 같은 연월의 전국 값을 사용한다.
+    """
+
+    def __init__(self, regions, months, rates, sha256):
+        self.regions = pd.Index(regions)
+        self.months = pd.Index(months)
+        self.rates = rates
+        self.sha256 = sha256
+
+    def lookup(self, region_keys, months):
+        region_idx = self.regions.get_indexer(pd.Index(region_keys).astype(str))
+        month_idx = self.months.get_indexer(pd.Index(months).astype(str))
+        found = (region_idx >= 0) & (month_idx >= 0)
+        result = np.full(len(month_idx), np.nan)
+        result[found] = self.rates[region_idx[found], month_idx[found]]
+
+        # 결측은 전국치로 대체
+        if NATIONAL in self.regions:
+            national = self.rates[self.regions.get_loc(NATIONAL)]
+            fill = np.isnan(result) & (month_idx >= 0)
+            result[fill] = national[month_idx[fill]]
+        return result
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compile_rate_table(csv_path, housing_type, sha256):
+    """
+    전환율 CSV를 (지역 x 연월) 배열로 변환 (연월 순 정렬, 지역별 앞/뒤 값으로 결측 채움)
+    """
+    rate_df = pd.read_csv(csv_path)
+    rate_df = rate_df[rate_df['주택유형별(1)'] == housing_type].copy()
+    rate_df['지역'] = rate_df['지역별(1)'].astype(str).str.strip()
+    rate_df = rate_df.drop_duplicates(subset=['지역']).set_index('지역')
+    rate_df = rate_df.drop(columns=['주택유형별(1)', '지역별(1)'])
+
+    # 연월 열을 (연, 월) 순으로 정렬
+    months = pd.DataFrame({'연월': rate_df.columns.astype(str)})
+    months['연'] = pd.to_numeric(months['연월'].str.slice(0, 4), errors='coerce')
+    months['월'] = pd.to_numeric(months['연월'].str.slice(5, 7), errors='coerce')
+    months = months.sort_values(['연', '월'], kind='stable')
+    rates = rate_df.apply(pd.to_numeric, errors='coerce')
+    rates.columns = rates.columns.astype(str)
+    rates = rates[months['연월']].ffill(axis=1).bfill(axis=1)
+    return RateTable(rates.index.to_numpy(dtype=str), months['연월'].to_numpy(dtype=str),
+                     rates.to_numpy(dtype=np.float64), sha256)
+
+
+def cache_path(csv_path, housing_type):
+    # CSV 옆에 저장 (예: 지역별_전월셰_전환율_2011_2025.아파트.npz)
+    return f"{os.path.splitext(csv_path)[0]}.{housing_type}.npz"
+
+
+def load_rate_table(csv_path=RATE_CSV, housing_type='아파트'):
+    """
+    전환율 배열을 불러오는 함수 (프로세스 안에서 공유)
+
+    1) 메모리 캐시: CSV의 수정시각/크기가 같으면 그대로 반환
+    2) 디스크 캐시: CSV 옆의 .npz에 저장된 sha256이 CSV와 같으면 불러옴
+    3) 둘 다 아니면 CSV를 변환하고 .npz로 저장
+    """
+    key = (os.path.abspath(csv_path), housing_type)
+    stat = os.stat(csv_path)
+    file_state = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == file_state:
+            return cached[1]
+
+        sha256 = file_sha256(csv_path)
+        npz_path = cache_path(csv_path, housing_type)
+        table = None
+        if cached is not None and cached[1].sha256 == sha256:
+            table = cached[1]
+        elif os.path.exists(npz_path):
+            try:
+                with np.load(npz_path, allow_pickle=False) as npz:
+                    if str(npz['sha256']) == sha256 and int(npz['version']) == CACHE_VERSION:
+                        table = RateTable(npz['regions'], npz['months'], npz['rates'], sha256)
+                        logging.info(f"전환율 캐시 로드: {npz_path}")
+            except Exception as e:
+                logging.warning(f"전환율 캐시를 읽을 수 없음 ({e}), 다시 생성합니다")
+
+        if table is None:
+            table = compile_rate_table(csv_path, housing_type, sha256)
+            try:
+                np.savez(npz_path, regions=table.regions.to_numpy(dtype=str), months=table.months.to_numpy(dtype=str),
+                         rates=table.rates, sha256=sha256, version=CACHE_VERSION)
+                logging.info(f"전환율 캐시 저장: {npz_path}")
+            except OSError as e:
+                logging.warning(f"전환율 캐시를 저장할 수 없음: {e}")
+
+        _cache[key] = (file_state, table)
+        return table
@@ -1,11 +1,9 @@
-import PublicDataReader as pdr
 import pandas as pd
+from source import code_tables
 
 def hdong_gen(ymd):
-    hdong = pdr.code_hdong()
+    hdong = code_tables.code_hdong() # 생성일자/말소일자는 날짜로 변환되어 있음
     hdong = hdong[~(hdong["읍면동명"] == '')] # 읍면동명이 비어있으면 제거 
-    hdong['말소일자'] = pd.to_datetime(hdong['말소일자'], format = '%Y%m%d')
-    hdong['생성일자'] = pd.to_datetime(hdong['생성일자'], format = '%Y%m%d')
     ymd = pd.to_datetime(ymd, format = '%y%m%d')
     # 생성일자와 말소일자 기준으로 제거
     cur_hdong_df = hdong[(hdong['생성일자']<ymd) & ((hdong['말소일자']>ymd) | hdong['말소일자'].isna())]
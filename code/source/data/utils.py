@@ -1,5 +1,5 @@
 import pandas as pd
-import sqlite3
+from source import db_writer
 
 def save_to_csv(data, file_path):
     data.to_csv(file_path, index=False)
@@ -7,7 +7,7 @@ def save_to_csv(data, file_path):
 def load_from_csv(file_path):
     return pd.read_csv(file_path)
 
-def save_to_db(data, db_path, table_name):
-    conn = sqlite3.connect(db_path)
-    data.to_sql(table_name, conn, if_exists='replace', index=False)
-    conn.close()
\ No newline at end of file
+def save_to_db(data, db_path, table_name, key_cols=None):
+    # key_cols가 있으면 키 기준 upsert, 없으면 테이블 교체 (한 트랜잭션, executemany 묶음)
+    return db_writer.bulk_write(db_path, data, table_name, key_cols=key_cols,
+                                if_exists='upsert' if key_cols else 'replace')
\ No newline at end of file
@@ -0,0 +1,132 @@
+import sqlite3
+import hashlib
+import logging
+
+from source import db_pool, schema as table_schema
+
+logging.basicConfig(level=logging.INFO)
+
+
+def deal_ymd_expr(prefix=''):
+    """
+    년/월/일로 만든 정수 거래일자 (YYYYMMDD) SQL 식, 일이 비어 있으면 date() 필터와 같이 NULL
+    (prefix는 트리거에서 'NEW.' 사용)
+    """
+    y, m, d = f'{prefix}년', f'{prefix}월', f'{prefix}일'
+    return (f"CASE WHEN {d} IS NULL OR {d} = '' THEN NULL "
+            f"ELSE CAST({y} AS INTEGER) * 10000 + CAST({m} AS INTEGER) * 100 + CAST({d} AS INTEGER) END")
+
+
+def row_fingerprint(*values):
+    """
+    원본 행 값들의 64비트 지문 (blake2b, SQLite INTEGER에 맞는 부호 있는 정수)
+
+    NULL과 빈 문자열을 구분하고 값 사이에 구분 문자를 넣어 ('1', '23')과 ('12', '3')이 다르게 계산된다.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for value in values:
+        digest.update(b'\x00' if value is None else str(value).encode('utf-8'))
+        digest.update(b'\x1f')
+    return int.from_bytes(digest.digest(), 'big', signed=True)
+
+
+def fingerprint_columns(columns):
+    """
+    지문 계산에 쓰는 원본 컬럼 (파생 컬럼 deal_ymd와 row_fp 자신은 제외, 테이블 컬럼 순서)
+    """
+    return [col for col in columns if col not in ('deal_ymd', table_schema.ROW_FP)]
+
+
+def get_columns(conn, table_name):
+    """
+    테이블 컬럼명 목록
+    """
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")]
+
+
+def add_deal_ymd(db_path, tables=('apt_raw', 'apt_lease_raw')):
+    """
+    거래 테이블에 정수 거래일자 컬럼(deal_ymd)과 인덱스를 추가하는 마이그레이션
+
+    - deal_ymd = 년 * 10000 + 월 * 100 + 일 (이미 채워진 행은 건너뜀, 여러 번 실행해도 안전)
+    - idx_{table}_deal_ymd 인덱스 생성
+    - 이후 INSERT되는 행도 deal_ymd가 채워지도록 트리거 생성
+
+    load_election_data는 deal_ymd가 있으면 인덱스 범위 조건으로 조회한다.
+    """
+    # 읽기 전용(immutable) 풀은 쓰기 전에 retire하고, 쓰는 동안 새 읽기는 대기
+    with db_pool.writing(db_path):
+        conn = sqlite3.connect(db_path)
+        try:
+            existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for table in tables:
+                if table not in existing:
+                    logging.warning(f"테이블이 없어 건너뜀: {table}")
+                    continue
+
+                with conn:
+                    if 'deal_ymd' not in get_columns(conn, table):
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN deal_ymd INTEGER")
+                        logging.info(f"{table}: deal_ymd 컬럼 추가")
+                    updated = conn.execute(
+                        f"UPDATE {table} SET deal_ymd = {deal_ymd_expr()} WHERE deal_ymd IS NULL").rowcount
+                    logging.info(f"{table}: deal_ymd {updated}행 계산")
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_deal_ymd ON {table}(deal_ymd)")
+                    conn.execute(f'''
+                        CREATE TRIGGER IF NOT EXISTS trg_{table}_deal_ymd AFTER INSERT ON {table}
+                        WHEN NEW.deal_ymd IS NULL
+                        BEGIN
+                            UPDATE {table} SET deal_ymd = {deal_ymd_expr('NEW.')}
+                            WHERE rowid = NEW.rowid;
+                        END
+                    ''')
+                logging.info(f"{table}: 인덱스/트리거 생성 완료")
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+
+
+def add_row_fp(db_path, tables=('apt_raw', 'apt_lease_raw')):
+    """
+    거래 테이블에 행 지문 컬럼(row_fp)과 인덱스를 추가하는 마이그레이션
+
+    - row_fp = 원본 컬럼 전체(deal_ymd 제외)의 64비트 blake2b 지문 (row_fingerprint)
+    - 값이 비어 있는 행만 계산 (여러 번 실행해도 안전)
+    - idx_{table}_row_fp 인덱스 생성
+
+    지문은 파이썬 함수로 계산하므로 트리거로 채울 수 없다. 새 데이터를 넣은 뒤에는 다시
+    실행해야 하며, 그 전까지 조회 함수는 SQL 중복 제거를 건너뛰고 전처리에서 전체 컬럼으로 중복을 제거한다.
+    load_election_data 등은 row_fp가 모두 채워져 있으면 GROUP BY row_fp로 중복을 DB에서 제거한다.
+    """
+    # 읽기 전용(immutable) 풀은 쓰기 전에 retire하고, 쓰는 동안 새 읽기는 대기
+    with db_pool.writing(db_path):
+        conn = sqlite3.connect(db_path)
+        conn.create_function('fingerprint', -1, row_fingerprint, deterministic=True)
+        try:
+            existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for table in tables:
+                if table not in existing:
+                    logging.warning(f"테이블이 없어 건너뜀: {table}")
+                    continue
+
+                with conn:
+                    columns = get_columns(conn, table)
+                    if table_schema.ROW_FP not in columns:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {table_schema.ROW_FP} INTEGER")
+                        logging.info(f"{table}: {table_schema.ROW_FP} 컬럼 추가")
+                    col_list = ', '.join(f'"{col}"' for col in fingerprint_columns(columns))
+                    updated = conn.execute(
+                        f"UPDATE {table} SET {table_schema.ROW_FP} = fingerprint({col_list}) "
+                        f"WHERE {table_schema.ROW_FP} IS NULL").rowcount
+                    logging.info(f"{table}: {table_schema.ROW_FP} {updated}행 계산")
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{table_schema.ROW_FP} ON {table}({table_schema.ROW_FP})")
+                logging.info(f"{table}: 행 지문 인덱스 생성 완료")
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+
+
+# 사용 예시
+if __name__ == "__main__":
+    add_deal_ymd("data/raw/RealEstate_optimized.db")
+    add_row_fp("data/raw/RealEstate_optimized.db")
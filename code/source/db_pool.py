@@ -0,0 +1,210 @@
+import os
+import queue
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+
+# 읽기 전용 연결 기본 설정
+MMAP_SIZE = 1 << 30  # 1GB 메모리 맵
+CACHE_SIZE = -262144  # 음수는 KiB 단위 (256MB 페이지 캐시)
+TEMP_STORE = 'MEMORY'
+POOL_SIZE = 4
+
+WRITE_WAIT_TIMEOUT = 60  # 쓰기 전 대여 중인 읽기 연결을 기다리는 최대 시간 (초)
+
+_pools = {}
+_writing = {}  # DB 경로 -> 진행 중인 쓰기 수
+_pools_lock = threading.Condition()
+
+
+class PoolRetired(Exception):
+    """
+    retire된 풀에서 연결을 요청할 때 발생 (connect는 새 풀로 다시 시도)
+    """
+
+
+class ReadOnlyPool:
+    """
+    하나의 SQLite 파일에 대한 읽기 전용 연결 풀
+
+    연결은 URI 모드(mode=ro, immutable=1)로 열고 mmap_size, cache_size, temp_store를
+    설정한다. 최대 size개의 연결을 필요할 때 만들고, 반환된 연결은 다음 요청에 재사용한다
+    (페이지 캐시와 메모리 맵이 호출 사이에 유지됨). 풀이 비어 있으면 연결이 반환될 때까지 기다린다.
+
+    immutable=1이면 SQLite가 파일 잠금/변경 확인을 하지 않으므로, DB를 수정하기 전에
+    writing(db_path)로 풀을 retire해야 한다 (DataLoader.save_data, db_writer, db_migration은 자동으로 함).
+    retire하면 쉬고 있는 연결은 바로 닫고, 다른 스레드가 쓰고 있는 연결은 반환될 때 닫는다.
+    """
+
+    def __init__(self, db_path, size=POOL_SIZE, immutable=True, mmap_size=MMAP_SIZE,
+                 cache_size=CACHE_SIZE, temp_store=TEMP_STORE):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"DB 파일을 찾을 수 없음: {db_path}")
+        self.db_path = db_path
+        self.size = size
+        self.immutable = immutable
+        self.pragmas = {'mmap_size': mmap_size, 'cache_size': cache_size, 'temp_store': temp_store, 'query_only': 1}
+        self.retired = False
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._in_use = 0
+        self._lock = threading.Condition()
+
+    def _open(self):
+        uri = f"file:{quote(os.path.abspath(self.db_path))}?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        # 풀의 연결은 여러 스레드가 번갈아 사용 (동시에 한 스레드만 사용)
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self.retired:
+                    raise PoolRetired(self.db_path)
+                try:
+                    conn = self._idle.get_nowait()
+                    self._in_use += 1
+                    return conn
+                except queue.Empty:
+                    pass
+                if self._created < self.size:
+                    self._created += 1
+                    try:
+                        conn = self._open()
+                    except Exception:
+                        self._created -= 1
+                        raise
+                    self._in_use += 1
+                    logging.info(f"읽기 전용 연결 생성 ({self._created}/{self.size}): {self.db_path}")
+                    return conn
+                # 연결이 반환되거나 풀이 retire될 때까지 대기
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._lock.wait(remaining)
+
+    def release(self, conn):
+        with self._lock:
+            self._in_use -= 1
+            if self.retired:
+                # retire된 풀의 연결은 재사용하지 않고 닫음
+                conn.close()
+                self._created -= 1
+            else:
+                self._idle.put(conn)
+            self._lock.notify_all()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def retire(self, wait_timeout=None):
+        """
+        새 연결 대여를 막고 쉬고 있는 연결을 닫는 함수 (대여 중인 연결은 반환될 때 닫힘)
+
+        wait_timeout이 주어지면 대여 중인 연결이 모두 반환될 때까지 최대 그 시간만큼 기다린다.
+        Returns:
+            bool: 대여 중인 연결이 남아 있지 않으면 True
+        """
+        with self._lock:
+            self.retired = True
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                    self._created -= 1
+                except queue.Empty:
+                    break
+            self._lock.notify_all()
+            if wait_timeout is not None:
+                self._lock.wait_for(lambda: self._in_use == 0, wait_timeout)
+            return self._in_use == 0
+
+    def close(self):
+        self.retire()
+
+
+def get_pool(db_path, **kwargs):
+    """
+    DB 파일별 읽기 전용 연결 풀 (프로세스당 하나, 처음 호출 시 kwargs로 생성)
+
+    writing(db_path)로 DB를 수정하는 중이면 끝날 때까지 기다린다.
+    """
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        _pools_lock.wait_for(lambda: key not in _writing)
+        if key not in _pools:
+            _pools[key] = ReadOnlyPool(db_path, **kwargs)
+        return _pools[key]
+
+
+@contextmanager
+def connect(db_path, timeout=None):
+    """
+    풀에서 읽기 전용 연결을 빌려 쓰는 컨텍스트 매니저
+
+    사용 예시:
+        with db_pool.connect(db_path) as conn:
+            df = pd.read_sql_query(query, conn)
+    """
+    while True:
+        pool = get_pool(db_path)
+        try:
+            conn = pool.acquire(timeout)
+        except PoolRetired:
+            continue  # 쓰기 때문에 retire된 풀이면 새 풀로 다시 시도
+        break
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+@contextmanager
+def writing(db_path, wait_timeout=WRITE_WAIT_TIMEOUT):
+    """
+    DB를 수정하는 동안 읽기 전용 풀을 쓰지 않게 하는 컨텍스트 매니저
+
+    들어갈 때 풀을 retire하고 대여 중인 연결이 반환될 때까지(최대 wait_timeout초) 기다린다.
+    블록 안에서는 새 읽기 요청(connect)이 대기하고, 끝나면 다음 읽기는 변경된 파일로 새 풀을 만든다.
+
+    사용 예시:
+        with db_pool.writing(db_path):
+            conn = sqlite3.connect(db_path)
+            ...
+    """
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        _writing[key] = _writing.get(key, 0) + 1
+        pool = _pools.pop(key, None)
+    try:
+        if pool is not None and not pool.retire(wait_timeout):
+            logging.warning(f"대여 중인 읽기 연결이 반환되지 않은 채 쓰기를 시작합니다: {db_path}")
+        yield
+    finally:
+        with _pools_lock:
+            _writing[key] -= 1
+            if not _writing[key]:
+                del _writing[key]
+            _pools_lock.notify_all()
+
+
+def close_pool(db_path):
+    """
+    DB 파일의 연결 풀을 retire하는 함수 (쉬는 연결은 바로, 대여 중인 연결은 반환될 때 닫힘)
+    """
+    with _pools_lock:
+        pool = _pools.pop(os.path.abspath(db_path), None)
+    if pool is not None:
+        pool.retire()
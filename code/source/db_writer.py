@@ -0,0 +1,148 @@
+import sqlite3
+import logging
+
+import numpy as np
+import pandas as pd
+
+from source import db_pool
+
+# 지니계수 결과 테이블의 키 (선거, 지역 단위, 지역, 기간)
+GINI_KEY_COLS = ['선거', '지역단위', '지역', '기간시작', '기간종료']
+
+
+def sql_type(dtype):
+    """
+    pandas dtype -> SQLite 컬럼 타입
+    """
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+def to_records(df, batch_size):
+    """
+    데이터프레임을 executemany용 튜플 묶음으로 변환 (결측은 NULL, 날짜는 ISO 문자열, numpy 스칼라는 파이썬 값)
+    """
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+    values = df.astype(object).where(df.notna(), None).to_numpy()
+    for start in range(0, len(values), batch_size):
+        yield [tuple(v.item() if isinstance(v, np.generic) else v for v in row)
+               for row in values[start:start + batch_size]]
+
+
+def bulk_write(db_path, df, table_name, key_cols=None, if_exists='upsert', batch_size=10_000, indexes=()):
+    """
+    데이터프레임을 한 트랜잭션 안에서 executemany 묶음으로 저장하는 함수
+
+    - if_exists='upsert': key_cols가 같은 행은 갱신, 없으면 추가 (INSERT ... ON CONFLICT DO UPDATE)
+    - if_exists='replace': 테이블을 지우고 다시 만든 뒤 추가
+    - if_exists='append': 그대로 추가
+    테이블이 없으면 dtype으로 만들고, 새 컬럼은 ALTER TABLE로 추가한다. key_cols에는
+    UNIQUE 인덱스(ux_{table}_key)를, indexes의 각 컬럼 묶음에는 일반 인덱스를 만든다.
+
+    Parameters:
+        db_path (str): DB 경로
+        df (pd.DataFrame): 저장할 데이터
+        table_name (str): 테이블명
+        key_cols (list): 행을 식별하는 키 컬럼 (upsert에 필요)
+        if_exists (str): 'upsert', 'replace', 'append'
+        batch_size (int): executemany 한 번에 넣는 행 수
+        indexes (list): 추가로 만들 인덱스 컬럼 묶음 목록 (예: [['지역'], ['선거', '지역단위']])
+
+    Returns:
+        int: 저장한 행 수
+    """
+    if if_exists not in ('upsert', 'replace', 'append'):
+        raise ValueError(f"알 수 없는 저장 방식: {if_exists}")
+    key_cols = list(key_cols or [])
+    if if_exists == 'upsert' and not key_cols:
+        raise ValueError("upsert에는 key_cols가 필요합니다")
+    missing = [col for col in key_cols if col not in df.columns]
+    if missing:
+        raise ValueError(f"키 컬럼이 데이터에 없음: {missing}")
+
+    columns = list(df.columns)
+    quoted = [f'"{col}"' for col in columns]
+    # 읽기 전용(immutable) 풀은 쓰기 전에 retire하고, 쓰는 동안 새 읽기는 대기
+    with db_pool.writing(db_path):
+        conn = sqlite3.connect(db_path)
+        try:
+            with conn:  # 한 트랜잭션 (예외 시 롤백)
+                if if_exists == 'replace':
+                    conn.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+                existing = [row[1] for row in conn.execute(f'PRAGMA table_info("{table_name}")')]
+                if not existing:
+                    col_defs = ', '.join(f'"{col}" {sql_type(df[col].dtype)}' for col in columns)
+                    conn.execute(f'CREATE TABLE "{table_name}" ({col_defs})')
+                else:
+                    for col in columns:
+                        if col not in existing:
+                            conn.execute(f'ALTER TABLE "{table_name}" ADD COLUMN "{col}" {sql_type(df[col].dtype)}')
+
+                # ON CONFLICT 대상이 되는 UNIQUE 인덱스
+                if key_cols:
+                    key_list = ', '.join(f'"{col}"' for col in key_cols)
+                    conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "ux_{table_name}_key" ON "{table_name}" ({key_list})')
+
+                query = f'INSERT INTO "{table_name}" ({", ".join(quoted)}) VALUES ({", ".join(["?"] * len(columns))})'
+                if if_exists == 'upsert':
+                    updates = [f'"{col}" = excluded."{col}"' for col in columns if col not in key_cols]
+                    query += f' ON CONFLICT ({key_list}) ' + (f'DO UPDATE SET {", ".join(updates)}' if updates else 'DO NOTHING')
+
+                n_rows = 0
+                for batch in to_records(df, batch_size):
+                    conn.executemany(query, batch)
+                    n_rows += len(batch)
+
+            # 조회용 인덱스는 적재 후 생성
+            with conn:
+                for index_cols in indexes:
+                    index_cols = [index_cols] if isinstance(index_cols, str) else list(index_cols)
+                    name = f"idx_{table_name}_{'_'.join(index_cols)}"
+                    col_list = ', '.join(f'"{col}"' for col in index_cols)
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table_name}" ({col_list})')
+            logging.info(f"{table_name}: {n_rows}행 저장 ({if_exists})")
+            return n_rows
+        finally:
+            conn.close()
+
+
+def gini_result_frame(grouped, election_name, region_unit, region_col, window):
+    """
+    지역별 지니계수 결과(calculate_stats의 grouped)를 (선거, 지역단위, 지역, 기간) 키를 가진 형태로 변환
+    (window는 load_data.get_election_window가 계산한 YYYY-MM-DD 시작일, 종료일)
+    """
+    frame = grouped.rename(columns={region_col: '지역'}).copy()
+    frame.insert(0, '기간종료', window[1])
+    frame.insert(0, '기간시작', window[0])
+    frame.insert(0, '지역단위', region_unit)
+    frame.insert(0, '선거', election_name)
+    frame['지역'] = frame['지역'].astype(str)
+    return frame
+
+
+def save_gini_results(results, db_path, region_unit, region_col, election_list, start_date=None, end_date=None,
+                      table_name='gini_results'):
+    """
+    선거별 지니계수 결과를 결과 테이블에 upsert하는 함수 (같은 선거/지역 단위/지역/기간은 갱신)
+
+    기간은 실제 조회 기간(선거일 기준 기본 기간 포함)을 YYYY-MM-DD로 저장하므로, 같은 기간을
+    datetime이나 'YYMMDD' 문자열 어느 쪽으로 넘겨도 같은 행이 갱신된다.
+
+    Parameters:
+        election_list (dict): {선거 이름: 선거 날짜(YYMMDD)}
+    """
+    from source.load_data import get_election_window  # load_data가 db_writer를 import하므로 여기서 import
+
+    frames = [gini_result_frame(result['bdong_gini'], election_name, region_unit, region_col,
+                                get_election_window(election_list[election_name], start_date, end_date))
+              for election_name, result in results.items()]
+    if not frames:
+        return 0
+    return bulk_write(db_path, pd.concat(frames, ignore_index=True), table_name, key_cols=GINI_KEY_COLS,
+                      indexes=[['지역단위', '지역']])
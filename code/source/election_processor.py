@@ -1,60 +1,134 @@
+import numpy as np
 import pandas as pd
 import logging
-from source import calculate_gini, load_data, preprocess, matching
+from source import calculate_gini, load_data, preprocess, matching, rolling_gini, pipeline, db_writer, memory_profile
 import os
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def process_election_data(election_data, election_name, election_date, region_unit, cur_date='240801'):
+def get_region_column(region_unit):
     """
-    선거 데이터 처리 및 지니계수 계산 함수
+    지역 단위에 해당하는 그룹 컬럼명을 반환하는 함수
+    """
+    # 디버깅: region_unit 값 확인 및 로그 출력
+    # '행정동'과 '읍면동'은 동일 취지로 처리
+    valid_units = ["시군구", "읍면동", "행정동", "선거구"]
+    logging.info("선택된 지역 단위 (region_unit): %s", region_unit)
+    logging.info("유효한 지역 단위 목록: %s", valid_units)
+
+    if region_unit == "시군구":
+        return '시도_시군구'
+    elif region_unit in ["읍면동", "행정동"]:
+        return '시도_시군구_읍면동'
+    elif region_unit == '선거구':
+        logging.info("선거구 단위로 지니계수 계산 중...")
+        return '시도명district'  # 수정: 결합된 칼럼 사용
+    else:
+        error_msg = f"유효하지 않은 지역 단위입니다: {region_unit}"
+        logging.error(error_msg)
+        raise ValueError(error_msg)
+
+def load_region_mappings(election_name, election_date, matcher, cur_date='240801'):
+    """
+    선거별 법정동 변환코드, 선거일 기준 행정동 코드, 행정동-선거구 매핑 테이블을 불러오는 함수
+    (청크 단위 처리에서 한 번만 불러와 재사용)
+
+    Returns:
+        dict: code_election_day, code_current, mapping_df, mapping_dict, code_admin, code_district
+              (매핑 파일이 없으면 None)
+    """
+    # 법정동코드 변환
+    logging.info("법정동코드 변환 시작")
+    code_election_day = matcher.gen_bdong(election_date)  # 선거일 법정동코드
+    code_current = matcher.gen_bdong(cur_date)  # 현재 법정동코드
+    mapping_file = f"data/processed/법정동_변환코드/{election_name}_법정동_변환코드.xlsx"
+
+    logging.info(f"법정동 변환코드 파일 로드: {mapping_file}")
+    if not os.path.exists(mapping_file):
+        logging.error(f"법정동 변환코드 파일을 찾을 수 없음: {mapping_file}")
+        return None
+
+    mapping_df = pd.read_excel(mapping_file)
+    mapping_df['법정동코드'] = mapping_df['법정동코드'].astype('string')
+    mapping_df['과거시점_법정동코드'] = mapping_df['과거시점_법정동코드'].apply(lambda x: '' if pd.isna(x) else str(int(x)))
+    mapping_dict = mapping_df.set_index('법정동코드')['과거시점_법정동코드'].to_dict()
+
+    # 선거일 기준 행정동 코드
+    election_date_dt = pd.to_datetime(election_date, format='%y%m%d')
+    code_df = matcher.conn_code
+    filtered_code = code_df[(code_df['생성일자'] < election_date_dt) & (code_df['말소일자'] > election_date_dt)]
+    filtered_code = filtered_code[filtered_code["읍면동명"] != ""]
+    logging.info(f"행정동 코드 필터링 결과: {len(filtered_code)}개 행정동")
+
+    # 행정동-선거구 매핑
+    district_mapping_file = f"data/processed/선거구수기2/{election_name}_선거구_행정동_매칭_수기2.xlsx"
+    if not os.path.exists(district_mapping_file):
+        logging.error(f"선거구 매핑 파일을 찾을 수 없음: {district_mapping_file}")
+        return None
+
+    district_df = pd.read_excel(district_mapping_file)
+    district_df['행정동코드'] = district_df['행정동코드'].astype('string')
+    logging.info(f"선거구 매핑 파일 로드 완료: {len(district_df)}개 행정동-선거구 매핑")
+
+    # 지역 단위별 그룹 라벨은 매핑 표(행정동 단위)에서 한 번만 만들고, 범주형(정수 코드)으로 거래에 붙임
+    district_df['시도_시군구'] = calculate_gini.combine_labels(district_df, ['시도명', '시군구명'])
+    district_df['시도_시군구_읍면동'] = calculate_gini.combine_labels(district_df, ['시도명', '시군구명', '읍면동명'])
+    # 시도명과 district를 결합한 새로운 칼럼 생성
+    district_df['시도명district'] = calculate_gini.combine_labels(district_df, ['시도명', 'district'])
+
+    return {
+        'code_election_day': code_election_day,
+        'code_current': code_current,
+        'mapping_df': mapping_df,
+        'mapping_dict': mapping_dict,
+        'code_admin': filtered_code,
+        'code_district': district_df,
+    }
+
+def map_election_regions(processed_data, election_name, election_date, matcher, cur_date='240801', tables=None,
+                         keep_intermediates=True, sample_rows=5000):
+    """
+    전처리된 거래 데이터에 선거일 기준 법정동 -> 행정동 -> 선거구를 매칭하는 함수
 
     Parameters:
-        election_data (dict): 선거 데이터 딕셔너리
+        processed_data (pd.DataFrame 또는 list): 전처리된 거래 데이터. [데이터프레임] 형태의
+            한 원소 리스트로 주면 꺼내서(pop) 넘겨받으므로, 호출한 쪽에 다른 참조가 없을 때
+            간소 모드에서 행정동 매칭이 끝나는 즉시 해제된다
         election_name (str): 선거 이름
         election_date (str): 선거 날짜 (YYMMDD 형식)
-        region_unit (str): 지역 단위 ('시군구', '읍면동', '선거구')
+        matcher (matching.Matcher): 코드 테이블을 가진 Matcher (선거 간 재사용 가능)
         cur_date (str): 수집시점 날짜 (기본값 '240801')
+        tables (dict): load_region_mappings 결과 (없으면 새로 불러옴)
+        keep_intermediates (bool): False면 processed_data를 복사하지 않고 그대로 가공하고,
+            raw_data와 merged_admin은 앞부분 sample_rows행만 남김 (processed_data가 바뀜)
+        sample_rows (int): keep_intermediates=False일 때 남기는 표본 행 수
 
     Returns:
-        dict: 처리된 결과들을 포함하는 딕셔너리
+        dict: 매칭 단계별 결과 (merged_district에 범주형 시도_시군구, 시도_시군구_읍면동, 시도명district 포함)
     """
     try:
-        logging.info(f"선거 데이터 처리 시작 - 선거: {election_name}, 날짜: {election_date}, 지역단위: {region_unit}")
-        
-        if election_name not in election_data:
-            logging.error(f"선거 데이터를 찾을 수 없음: {election_name}")
-            return None
-            
-        logging.info("0. RAW 데이터의 수: %s", election_data[election_name].shape)
-        processor = preprocess.DataProcessor(election_data[election_name])
-        processed_data = processor.preprocessing()
-        logging.info("1. 전처리된 데이터의 수: %s", processed_data.shape)
-        
-        # 법정동코드 변환
-        logging.info("법정동코드 변환 시작")
-        matcher = matching.Matcher(processed_data)
-        code_election_day = matcher.gen_bdong(election_date)  # 선거일 법정동코드
-        code_current = matcher.gen_bdong(cur_date)  # 현재 법정동코드
-        
-        raw_data = processed_data.copy()
-        mapping_file = f"data/processed/법정동_변환코드/{election_name}_법정동_변환코드.xlsx"
-        
-        logging.info(f"법정동 변환코드 파일 로드: {mapping_file}")
-        if not os.path.exists(mapping_file):
-            logging.error(f"법정동 변환코드 파일을 찾을 수 없음: {mapping_file}")
-            return None
-            
-        mapping_df = pd.read_excel(mapping_file)
+        if isinstance(processed_data, list):
+            processed_data = processed_data.pop()
+        if tables is None:
+            tables = load_region_mappings(election_name, election_date, matcher, cur_date)
+            if tables is None:
+                return None
+        mapping_dict = tables['mapping_dict']
+        filtered_code = tables['code_admin']
+        district_df = tables['code_district']
         
         # 데이터 타입 통일 및 변환
         logging.info("데이터 타입 변환 및 매핑 시작")
-        raw_data['법정동코드'] = raw_data['법정동코드'].astype('string')
-        mapping_df['법정동코드'] = mapping_df['법정동코드'].astype('string')
-        mapping_df['과거시점_법정동코드'] = mapping_df['과거시점_법정동코드'].apply(lambda x: '' if pd.isna(x) else str(int(x)))
-        mapping_dict = mapping_df.set_index('법정동코드')['과거시점_법정동코드'].to_dict()
-        
-        data_mapped = raw_data.copy()
+        if keep_intermediates:
+            raw_data = processed_data.copy()
+            raw_data['법정동코드'] = raw_data['법정동코드'].astype('string')
+            data_mapped = raw_data.copy()
+        else:
+            # 복사 없이 가공하고 저장용 표본만 따로 보관
+            data_mapped = processed_data
+            del processed_data
+            data_mapped['법정동코드'] = data_mapped['법정동코드'].astype('string')
+            raw_data = data_mapped.head(sample_rows).copy()
         data_mapped['현재시점_법정동코드'] = data_mapped['법정동코드']
         data_mapped['법정동코드'] = data_mapped['법정동코드'].map(mapping_dict)
         data_mapped['법정동코드'] = data_mapped['법정동코드'].astype('string')
@@ -63,84 +137,115 @@ def process_election_data(election_data, election_name, election_date, region_un
         
         # 행정동 코드 매칭
         logging.info("행정동 코드 매칭 시작")
-        election_date_dt = pd.to_datetime(election_date, format='%y%m%d')
-        code_df = matcher.conn_code
-        filtered_code = code_df[(code_df['생성일자'] < election_date_dt) & (code_df['말소일자'] > election_date_dt)]
-        filtered_code = filtered_code[filtered_code["읍면동명"] != ""]
-        code_admin = filtered_code
-        
-        logging.info(f"행정동 코드 필터링 결과: {len(filtered_code)}개 행정동")
         merged_data = pd.merge(data_mapped,
                              filtered_code[["법정동코드", "행정동코드", "생성일자", "말소일자"]],
                              how='left',
                              on='법정동코드')
+        n_rows = data_mapped.shape
         logging.info("3. 행정동 코드 매칭 데이터의 수: %s, 매칭 안된 행: %d", 
-                     data_mapped.shape, merged_data['행정동코드'].isna().sum())
+                     n_rows, merged_data['행정동코드'].isna().sum())
+        del data_mapped
         
         # 선거구 매칭
         logging.info("선거구 매칭 시작")
-        district_mapping_file = f"data/processed/선거구수기2/{election_name}_선거구_행정동_매칭_수기2.xlsx"
-        
-        if not os.path.exists(district_mapping_file):
-            logging.error(f"선거구 매핑 파일을 찾을 수 없음: {district_mapping_file}")
-            return None
-            
-        district_df = pd.read_excel(district_mapping_file)
-        district_df['행정동코드'] = district_df['행정동코드'].astype('string')
-        logging.info(f"선거구 매핑 파일 로드 완료: {len(district_df)}개 행정동-선거구 매핑")
-        
         # 불필요한 컬럼 제거
         columns_to_exclude = ['시도명', '시군구명', '읍면동명']
-        merged_data = merged_data.drop(columns=[col for col in columns_to_exclude if col in merged_data.columns])
+        merged_data.drop(columns=[col for col in columns_to_exclude if col in merged_data.columns], inplace=True)
         
         merged_district = merged_data.merge(district_df, how='left', on='행정동코드')
+        if not keep_intermediates:
+            merged_data = merged_data.head(sample_rows)
         logging.info("4. 선거구 매칭 데이터의 수: %s, 매칭 안된 행: %d", 
-                     data_mapped.shape, merged_district['district'].isna().sum())
+                     n_rows, merged_district['district'].isna().sum())
+        # 지역 단위별 그룹 컬럼(시도_시군구, 시도_시군구_읍면동, 시도명district)은 매핑 표에서 범주형으로 붙음
+        return {
+            'raw_data': raw_data,
+            'code_election_day': tables['code_election_day'],
+            'code_current': tables['code_current'],
+            'mapping_df': tables['mapping_df'],
+            'code_district': district_df,
+            'merged_admin': merged_data,
+            'code_admin': filtered_code,
+            'merged_district': merged_district,
+        }
+
+    except Exception as e:
+        logging.error("Error in map_election_regions: %s", str(e))
+        raise
+
+def process_election_data(election_data, election_name, election_date, region_unit, cur_date='240801',
+                          keep_intermediates=True, memory_budget_mb=None):
+    """
+    선거 데이터 처리 및 지니계수 계산 함수
+
+    Parameters:
+        election_data (dict): 선거 데이터 딕셔너리
+        election_name (str): 선거 이름
+        election_date (str): 선거 날짜 (YYMMDD 형식)
+        region_unit (str): 지역 단위 ('시군구', '읍면동', '선거구')
+        cur_date (str): 수집시점 날짜 (기본값 '240801')
+        keep_intermediates (bool): False면 복사 없이 처리하고 중간 결과(raw_data, merged_admin,
+            merged_district)는 앞부분 5000행 표본만 남김. 이때 election_data에서 해당 선거의
+            원본을 꺼내(pop) 처리 중에 해제한다
+        memory_budget_mb (float): 메모리 예산 (MB). 전체 모드의 예상 사용량이 예산을 넘으면
+            keep_intermediates=False로 처리하고, 단계별 최대 RSS가 예산을 넘으면 경고
+
+    Returns:
+        dict: 처리된 결과들을 포함하는 딕셔너리 (단계별_메모리: 단계별 소요시간과 최대 RSS)
+    """
+    try:
+        logging.info(f"선거 데이터 처리 시작 - 선거: {election_name}, 날짜: {election_date}, 지역단위: {region_unit}")
+        
+        if election_name not in election_data:
+            logging.error(f"선거 데이터를 찾을 수 없음: {election_name}")
+            return None
+            
+        logging.info("0. RAW 데이터의 수: %s", election_data[election_name].shape)
+        tracker = memory_profile.StageTracker(election_name, memory_budget_mb)
+        if keep_intermediates and memory_profile.needs_lean_mode(election_data[election_name], memory_budget_mb):
+            keep_intermediates = False
+
+        with tracker.stage('전처리'):
+            if keep_intermediates:
+                processed_data = preprocess.DataProcessor(election_data[election_name]).preprocessing()
+            else:
+                # 원본은 전처리 중에 해제 (호출한 쪽의 election_data에서도 제거됨)
+                processed_data = preprocess.DataProcessor(election_data.pop(election_name)).preprocessing(copy=False)
+        logging.info("1. 전처리된 데이터의 수: %s", processed_data.shape)
         
+        # 법정동코드 변환 ~ 선거구 매칭
+        with tracker.stage('지역 매칭'):
+            # 매칭에는 Matcher의 코드 테이블만 쓰이므로 간소 모드에서는 데이터 참조를 남기지 않고,
+            # 전처리 결과는 리스트로 넘겨 map_election_regions가 유일한 참조를 갖게 함
+            matcher = matching.Matcher(processed_data if keep_intermediates else None)
+            owned = [processed_data]
+            del processed_data
+            mapped = map_election_regions(owned, election_name, election_date, matcher, cur_date,
+                                          keep_intermediates=keep_intermediates)
+            del owned, matcher
+        if mapped is None:
+            return None
+        merged_district = mapped['merged_district']
+
         # 선거구별 지니계수 계산
         logging.info("지니계수 계산 시작")
-        merged_district['시도_시군구'] = merged_district['시도명'] + '_' + merged_district['시군구명']
-        merged_district['시도_시군구_읍면동'] = merged_district['시도명'] + '_' + merged_district['시군구명'] + '_' + merged_district['읍면동명']
-        # 시도명과 district를 결합한 새로운 칼럼 생성
-        merged_district['시도명district'] = merged_district['시도명'] + '_' + merged_district['district']
-        gini_calculator = calculate_gini.GiniCalculator(merged_district)
-        
-        # 디버깅: region_unit 값 확인 및 로그 출력
-        # '행정동'과 '읍면동'은 동일 취지로 처리
-        valid_units = ["시군구", "읍면동", "행정동", "선거구"]
-        logging.info("선택된 지역 단위 (region_unit): %s", region_unit)
-        logging.info("유효한 지역 단위 목록: %s", valid_units)
-
-        if region_unit == "시군구":
-            region_column = '시도_시군구'
-        elif region_unit in ["읍면동", "행정동"]:
-            region_column = '시도_시군구_읍면동'
-        elif region_unit == '선거구':
-            region_column = '시도명district'  # 수정: 결합된 칼럼 사용
-            logging.info("선거구 단위로 지니계수 계산 중...")
-        else:
-            error_msg = f"유효하지 않은 지역 단위입니다: {region_unit}"
-            logging.error(error_msg)
-            raise ValueError(error_msg)
-        
-        logging.info(f"지니계수 계산에 사용될 컬럼: {region_column}")
-        gini_result = gini_calculator.calculate_stats(region_column)
+        with tracker.stage('지니계수'):
+            gini_calculator = calculate_gini.GiniCalculator(merged_district)
+            
+            region_column = get_region_column(region_unit)
+            logging.info(f"지니계수 계산에 사용될 컬럼: {region_column}")
+            gini_result = gini_calculator.calculate_stats(region_column)
+            del gini_calculator
         
         if gini_result is None:
             logging.error("지니계수 계산 결과가 None입니다")
             return None
             
-        result = {
-            'raw_data': raw_data,
-            'code_election_day': code_election_day,
-            'code_current': code_current,
-            'mapping_df': mapping_df,
-            'code_district': district_df,
-            'merged_admin': merged_data,
-            'code_admin': code_admin,
-            'merged_district': merged_district,
-            'bdong_gini': gini_result['grouped']
-        }
+        result = dict(mapped, bdong_gini=gini_result['grouped'], 단계별_메모리=tracker.report())
+        if not keep_intermediates:
+            # 누락 선거구는 전체 데이터 기준으로 계산한 뒤 표본만 남김
+            result['누락_선거구'] = set(mapped['code_district'].district) - set(merged_district['district'].dropna())
+            result['merged_district'] = merged_district.head(5000)
         
         logging.info(f"{election_name} 데이터 처리 완료")
         return result
@@ -149,6 +254,96 @@ def process_election_data(election_data, election_name, election_date, region_un
         logging.error("Error in process_election_data: %s", str(e))
         raise
 
+def process_election_streaming(election_name, election_date, db_path, table_name, start_date=None, end_date=None,
+                               region_unit='시군구', chunksize=200_000, cur_date='240801', sample_rows=5000, filters=None):
+    """
+    선거 데이터를 청크 단위로 읽어 전처리/매칭하고 지니계수를 계산하는 함수 (스트리밍 모드)
+
+    청크마다 전처리와 법정동 -> 행정동 -> 선거구 매칭을 한 뒤 (지역코드, 거래금액, 평당거래금액)
+    배열만 남기고, 모든 청크를 읽은 후 grouped_gini로 한 번에 집계한다. 원본/중간 데이터는
+    저장용 앞부분 sample_rows행만 유지한다. 결과는 calculate_stats와 같다.
+
+    Returns:
+        dict: process_election_data와 같은 키 (raw_data, merged_admin, merged_district는 앞부분 표본)
+    """
+    try:
+        logging.info(f"스트리밍 처리 시작 - 선거: {election_name}, 지역단위: {region_unit}, 청크: {chunksize}행")
+        region_column = get_region_column(region_unit)
+        matcher = matching.Matcher(None)
+        tables = load_region_mappings(election_name, election_date, matcher, cur_date)
+        if tables is None:
+            return None
+
+        label_index = {}  # 지역명 -> 지역코드 (청크 간 공유)
+        code_parts, value_parts = [], []
+        samples = {'raw_data': [], 'merged_admin': [], 'merged_district': []}
+        n_sampled = 0
+        districts = set()
+        for i, chunk in enumerate(load_data.iter_election_chunks(db_path, table_name, election_date, start_date, end_date,
+                                                                 columns='sale', chunksize=chunksize, filters=filters)):
+            processed = [preprocess.DataProcessor(chunk).preprocessing()]
+            del chunk
+            mapped = map_election_regions(processed, election_name, election_date, matcher, cur_date, tables=tables,
+                                          keep_intermediates=False, sample_rows=sample_rows)
+            merged_district = mapped['merged_district']
+            logging.info(f"청크 {i}: {len(merged_district)}행")
+
+            # 지역명을 청크 간 공통 정수 코드로 변환 (결측 지역은 -1)
+            chunk_codes, uniques = pd.factorize(merged_district[region_column])
+            lookup = np.array([label_index.setdefault(label, len(label_index)) for label in uniques] + [-1], dtype=np.int64)
+            code_parts.append(lookup[chunk_codes].astype(np.int32))
+            value_parts.append(merged_district[['거래금액', '평당거래금액']].apply(pd.to_numeric, errors='coerce')
+                               .to_numpy(dtype=np.float64))
+            districts.update(merged_district['district'].dropna())
+
+            if n_sampled < sample_rows:
+                for key in samples:
+                    samples[key].append(mapped[key].head(sample_rows - n_sampled))
+                n_sampled += len(samples['raw_data'][-1])
+            del mapped, merged_district
+
+        if not label_index:
+            logging.error(f"{election_name}: 집계할 데이터가 없습니다")
+            return None
+
+        # 지역명 정렬 순서로 코드 재배열 (groupby 결과 순서와 동일)
+        labels = np.array(list(label_index), dtype=object)
+        sort_order = np.argsort(labels, kind='stable')
+        remap = np.append(np.empty_like(sort_order), -1)
+        remap[sort_order] = np.arange(len(labels))
+        codes = remap[np.concatenate(code_parts)]
+        values = np.concatenate(value_parts)
+        del code_parts, value_parts
+        n_groups = len(labels)
+
+        logging.info(f"지니계수 계산 시작 - {len(codes)}행, 지역 {n_groups}개")
+        valid = codes >= 0
+        grouped = pd.DataFrame({region_column: labels[sort_order]})
+        stats = {}
+        for i, name in enumerate(['', '평당_']):
+            has_value = valid & ~np.isnan(values[:, i])
+            count = np.bincount(codes[has_value], minlength=n_groups)
+            total = np.bincount(codes[has_value], weights=values[has_value, i], minlength=n_groups)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                stats[name] = (count, total / count)
+        gini_values = calculate_gini.grouped_gini(codes, values, n_groups)
+        grouped['거래수'] = stats[''][0]
+        grouped['평균거래금액'] = stats[''][1]
+        grouped['지니계수'] = gini_values[:, 0]
+        grouped['평당_평균거래금액'] = stats['평당_'][1]
+        grouped['평당_지니계수'] = gini_values[:, 1]
+
+        result = {key: pd.concat(parts, ignore_index=True) for key, parts in samples.items()}
+        result.update({key: tables[key] for key in ['code_election_day', 'code_current', 'mapping_df', 'code_admin', 'code_district']})
+        result['bdong_gini'] = grouped
+        result['누락_선거구'] = set(tables['code_district'].district) - districts
+        logging.info(f"{election_name} 스트리밍 처리 완료")
+        return result
+
+    except Exception as e:
+        logging.error("Error in process_election_streaming: %s", str(e))
+        raise
+
 def create_folder():
     import datetime
     
@@ -160,6 +355,19 @@ def create_folder():
         logging.info(f"결과 저장 디렉토리 생성: {directory}")
     return directory
 
+# 결과 Excel 시트 (결과 키, 시트명, 최대 행 수)
+RESULT_SHEETS = [
+    ('raw_data', '아파트_원본', 5000),
+    ('code_election_day', '선거일_법정동코드', 5000),
+    ('code_current', '현행_법정동코드', 5000),
+    ('mapping_df', '법정동_매핑', 5000),
+    ('merged_admin', '법정동_행정동_매핑코드', 5000),
+    ('merged_district', '아파트_행정동', 5000),
+    ('code_district', '행정동_선거구_매핑코드', None),
+    ('merged_district', '아파트_선거구', 5000),
+    ('bdong_gini', '선거구별_지니계수', 5000),
+]
+
 def save_results(results, election_name, region_unit, directory, start_date=None, end_date=None):
     """
     처리된 결과를 Excel 파일로 저장하는 함수
@@ -193,59 +401,239 @@ def save_results(results, election_name, region_unit, directory, start_date=None
         logging.info(f"{election_name} 결과 저장 시작")
         with pd.ExcelWriter(file_path) as writer:
             result = results[election_name]
-            result['raw_data'].head(5000).to_excel(writer, sheet_name='아파트_원본', index=False)
-            result['code_election_day'].head(5000).to_excel(writer, sheet_name='선거일_법정동코드', index=False)
-            result['code_current'].head(5000).to_excel(writer, sheet_name='현행_법정동코드', index=False)
-            result['mapping_df'].head(5000).to_excel(writer, sheet_name='법정동_매핑', index=False)
-            result['merged_admin'].head(5000).to_excel(writer, sheet_name='법정동_행정동_매핑코드', index=False)
-            result['merged_district'].head(5000).to_excel(writer, sheet_name='아파트_행정동', index=False)
-            result['code_district'].to_excel(writer, sheet_name='행정동_선거구_매핑코드', index=False)
-            result['merged_district'].head(5000).to_excel(writer, sheet_name='아파트_선거구', index=False)
-            result['bdong_gini'].head(5000).to_excel(writer, sheet_name='선거구별_지니계수', index=False)
+            # 간소 모드 등으로 없는 항목은 건너뜀
+            for key, sheet_name, limit in RESULT_SHEETS:
+                if result.get(key) is not None:
+                    frame = result[key] if limit is None else result[key].head(limit)
+                    frame.to_excel(writer, sheet_name=sheet_name, index=False)
             
             # 누락 데이터 저장
-            누락_선거구 = list(set(result['code_district'].district) - set(result['merged_district'].district))
-            pd.DataFrame(누락_선거구, columns=['누락된_선거구']).to_excel(writer, sheet_name='누락_선거구')
-            result['merged_admin'].head(5000).to_excel(writer, sheet_name='누락_행정동코드', index=False)
+            if '누락_선거구' in result or result.get('merged_district') is not None:
+                누락_선거구 = list(result.get('누락_선거구', set(result['code_district'].district) - set(result['merged_district'].district)))
+                pd.DataFrame(누락_선거구, columns=['누락된_선거구']).to_excel(writer, sheet_name='누락_선거구')
+            if result.get('merged_admin') is not None:
+                result['merged_admin'].head(5000).to_excel(writer, sheet_name='누락_행정동코드', index=False)
+            if result.get('단계별_메모리') is not None:
+                result['단계별_메모리'].to_excel(writer, sheet_name='단계별_메모리', index=False)
             
         logging.info(f"결과 저장 완료: {file_path}")
     except Exception as e:
         logging.error(f"결과 저장 중 오류 발생: {str(e)}")
         raise
 
-def process_and_save_all_elections(election_list, db_path, table_name, start_date=None, end_date=None, region_unit='시군구'):
+def process_all_elections_batch(election_list, db_path, table_name, start_date=None, end_date=None, region_unit='시군구', save=True,
+                                filters=None, keep_intermediates=None, memory_budget_mb=None):
+    """
+    모든 선거를 한 번의 로드/전처리와 한 번의 그룹 집계로 처리하는 함수
+
+    선거별 기간을 한 번의 쿼리로 읽고 전처리와 코드 테이블 로드(Matcher)도 한 번만 한다.
+    각 거래는 자신이 속한 모든 선거 기간에 '선거' 태그로 들어가고, 선거별 매핑 후
+    (선거, 지역) 쌍의 지니계수를 한 번의 그룹 집계로 계산한다.
+
+    keep_intermediates(기본값: save가 아닐 때만 True)가 False면 전처리와 선거별 매핑을 복사 없이 하고
+    중간 결과는 앞부분 5000행 표본만 남긴다. memory_budget_mb가 주어지면 전체 기간 원본의 예상
+    사용량이 예산을 넘을 때 keep_intermediates=False로 처리한다. save=True면 저장이 끝난 선거는
+    작은 결과(compact_result_entry)만 반환한다.
+
+    Returns:
+        dict: process_and_save_all_elections와 같은 선거별 결과 딕셔너리
+    """
+    try:
+        logging.info(f"일괄 처리 시작 - 선거: {list(election_list.keys())}, 기간: {start_date} ~ {end_date}")
+        raw, windows = load_data.load_election_windows(election_list, db_path, table_name, start_date, end_date, columns='sale',
+                                                       filters=filters)
+        if keep_intermediates is None:
+            keep_intermediates = not save
+        if keep_intermediates and memory_profile.needs_lean_mode(raw, memory_budget_mb):
+            keep_intermediates = False
+        # 간소 모드에서는 원본을 복사 없이 전처리하고 바로 해제
+        processed_data = preprocess.DataProcessor(raw).preprocessing(copy=keep_intermediates)
+        del raw
+        logging.info("1. 전처리된 데이터의 수: %s", processed_data.shape)
+        matcher = matching.Matcher(processed_data if keep_intermediates else None)
+        region_column = get_region_column(region_unit)
+
+        mapped_results = {}
+        tagged = []
+        for election_name, election_date in election_list.items():
+            window_start, window_end = windows[election_name]
+            in_window = processed_data['거래일자'].between(pd.Timestamp(window_start), pd.Timestamp(window_end))
+            logging.info(f"{election_name} 기간 {window_start} ~ {window_end}: {in_window.sum()}건")
+            mapped = map_election_regions([processed_data[in_window]], election_name, election_date, matcher,
+                                          keep_intermediates=keep_intermediates)
+            if mapped is None:
+                logging.error(f"{election_name} 처리 실패")
+                continue
+            tagged.append(mapped['merged_district'][[region_column, '거래금액', '평당거래금액', '거래일자']]
+                          .assign(선거=election_name))
+            # 누락 선거구는 전체 매핑 기준으로 계산한 뒤 중간 결과는 표본만 남김
+            mapped['누락_선거구'] = set(mapped['code_district'].district) - set(mapped['merged_district'].district)
+            if not keep_intermediates:
+                mapped['merged_district'] = mapped['merged_district'].head(5000)
+            mapped_results[election_name] = mapped
+        del processed_data, matcher
+
+        if not tagged:
+            return {}
+
+        # 선거마다 다른 지역 범주를 합쳐 concat 후에도 범주형(정수 코드)으로 유지
+        categories = sorted(set().union(*(frame[region_column].cat.categories for frame in tagged)))
+        for frame in tagged:
+            frame[region_column] = frame[region_column].cat.set_categories(categories)
+
+        # (선거, 지역) 쌍 전체를 한 번에 집계
+        gini_result = calculate_gini.GiniCalculator(pd.concat(tagged, ignore_index=True)).calculate_stats(['선거', region_column])
+        grouped = gini_result['grouped']
+
+        results = {}
+        folder = create_folder() if save else None
+        for election_name, mapped in mapped_results.items():
+            result = dict(mapped, bdong_gini=grouped[grouped['선거'] == election_name].drop(columns=['선거']).reset_index(drop=True))
+            result['누락_행정동코드'] = result['code_district'][result['code_district'].district.isin(result['누락_선거구'])]
+            results[election_name] = result
+            if save:
+                save_results(results, election_name, region_unit, folder, start_date, end_date)
+                results[election_name] = compact_result_entry(result)
+            del result
+        mapped_results.clear()
+
+        logging.info("일괄 처리 완료")
+        return results
+
+    except Exception as e:
+        logging.error(f"일괄 처리 중 오류 발생: {str(e)}")
+        raise
+
+def build_result_entry(result):
+    """
+    선거별 처리 결과에서 저장/반환할 항목과 누락 항목을 정리하는 함수
+    """
+    keys = ['raw_data', 'code_election_day', 'code_current', 'code_district', 'mapping_df', 'merged_admin',
+            'code_admin', 'merged_district', 'bdong_gini', '단계별_메모리']
+    entry = {key: result[key] for key in keys if key in result}
+
+    # 누락 항목 계산 (스트리밍/간소 모드는 전체 데이터 기준으로 계산된 값 사용)
+    entry['누락_선거구'] = result.get('누락_선거구', set(entry['code_district'].district) - set(entry['merged_district'].district))
+    entry['누락_행정동코드'] = entry['code_district'][entry['code_district'].district.isin(entry['누락_선거구'])]
+    return entry
+
+# 저장 후에도 반환값에 남기는 작은 결과
+COMPACT_RESULT_KEYS = ['bdong_gini', '누락_선거구', '누락_행정동코드', 'code_district', '단계별_메모리']
+
+def compact_result_entry(entry):
+    """
+    저장이 끝난 선거 결과에서 원본/중간 데이터(raw_data, mapping_df, merged_admin, merged_district 등)를 뺀 결과
+    """
+    return {key: entry[key] for key in COMPACT_RESULT_KEYS if key in entry}
+
+def process_all_elections_pipelined(election_list, db_path, table_name, start_date=None, end_date=None, region_unit='시군구',
+                                    parquet_path=None, max_in_flight=3, filters=None, keep_intermediates=True,
+                                    memory_budget_mb=None):
+    """
+    선거별 로드/처리/저장을 겹쳐 실행하는 함수 (pipeline.run_pipelined)
+
+    선거 k를 전처리/지니계수 계산하는 동안 k+1을 백그라운드 스레드에서 로드하고 k-1을
+    Excel로 저장한다. 로드된 원본은 처리 후 바로 해제되고, 저장이 끝난 선거는 작은 결과
+    (compact_result_entry)만 남기므로 원본/중간 데이터가 메모리에 있는 선거는 최대 max_in_flight개다.
+    반환값의 선거별 결과에는 bdong_gini, 누락_선거구, 누락_행정동코드, code_district(, 단계별_메모리)만 있다.
+    """
+    logging.info(f"파이프라인 처리 시작 - 선거: {list(election_list.keys())}, 기간: {start_date} ~ {end_date}")
+    folder = create_folder()
+    results = {}
+
+    def load(item):
+        election_name, election_date = item
+        if parquet_path is not None:
+            return load_data.load_election_parquet({election_name: election_date}, parquet_path, start_date, end_date,
+                                                   columns='sale', filters=filters)
+        return load_data.load_election_data({election_name: election_date}, db_path, table_name, start_date, end_date,
+                                            columns='sale', filters=filters)
+
+    def process(item, election_data):
+        election_name, election_date = item
+        logging.info(f"{election_name} 처리 시작...")
+        result = process_election_data(election_data, election_name, election_date, region_unit,
+                                       keep_intermediates=keep_intermediates, memory_budget_mb=memory_budget_mb)
+        if result is None:
+            logging.error(f"{election_name} 처리 실패")
+            return None
+        results[election_name] = build_result_entry(result)
+        logging.info(f"{election_name} 처리 완료")
+        return election_name
+
+    def save(item, election_name):
+        save_results(results, election_name, region_unit, folder, start_date, end_date)
+        # 저장이 끝나면 원본/중간 데이터를 해제
+        results[election_name] = compact_result_entry(results[election_name])
+
+    pipeline.run_pipelined(list(election_list.items()), load, process, save, max_in_flight=max_in_flight)
+    logging.info("모든 선거 데이터 처리 및 저장 완료")
+    return results
+
+def process_and_save_all_elections(election_list, db_path, table_name, start_date=None, end_date=None, region_unit='시군구', batch=False,
+                                   stream=False, chunksize=200_000, parquet_path=None, pipelined=False, filters=None,
+                                   result_db=None, keep_intermediates=None, memory_budget_mb=None):
     """
     모든 선거 데이터를 처리하고 저장하는 함수
+    batch=True면 모든 선거를 한 번에 로드/전처리/집계 (process_all_elections_batch)
+    stream=True면 선거별로 chunksize 행씩 읽어 처리 (process_election_streaming, 메모리 사용량 제한)
+    parquet_path가 주어지면 SQLite 대신 년/월 파티션 Parquet 데이터셋에서 읽음 (parquet_export 참조)
+    pipelined=True면 다음 선거 로드와 이전 선거 저장을 현재 선거 처리와 겹쳐 실행 (process_all_elections_pipelined)
+    filters는 DB 조회 조건으로 전달됨 (예: {'전용면적': {'max': 85}, '지역코드': {'prefix': ['11', '28', '41']}},
+    load_data.compile_filters 참조)
+    result_db가 주어지면 지역별 지니계수를 그 DB의 gini_results 테이블에 (선거, 지역단위, 지역, 기간) 키로 upsert
+    keep_intermediates=False면 선거별 원본을 복사 없이 처리하고 중간 결과는 표본만 남김 (스트리밍은 항상 표본만)
+    None이면 일괄 처리는 process_all_elections_batch의 기본값(저장하므로 False), 나머지는 True
+    memory_budget_mb가 주어지면 예상 사용량이 예산을 넘는 선거(일괄 처리는 전체)는 keep_intermediates=False로 처리하고,
+    단계별 최대 RSS가 예산을 넘으면 경고 (결과의 단계별_메모리 참조, 일괄/스트리밍 제외)
+    """
+    if batch:
+        results = process_all_elections_batch(election_list, db_path, table_name, start_date, end_date, region_unit, filters=filters,
+                                              keep_intermediates=keep_intermediates, memory_budget_mb=memory_budget_mb)
+    elif pipelined and not stream:
+        results = process_all_elections_pipelined(election_list, db_path, table_name, start_date, end_date, region_unit, parquet_path,
+                                                  filters=filters, keep_intermediates=keep_intermediates is not False,
+                                                  memory_budget_mb=memory_budget_mb)
+    else:
+        results = process_elections_sequential(election_list, db_path, table_name, start_date, end_date, region_unit,
+                                               stream, chunksize, parquet_path, filters, keep_intermediates is not False,
+                                               memory_budget_mb)
+    if result_db is not None and results:
+        db_writer.save_gini_results(results, result_db, region_unit, get_region_column(region_unit), election_list,
+                                    start_date, end_date)
+    return results
+
+def process_elections_sequential(election_list, db_path, table_name, start_date=None, end_date=None, region_unit='시군구',
+                                 stream=False, chunksize=200_000, parquet_path=None, filters=None, keep_intermediates=True,
+                                 memory_budget_mb=None):
+    """
+    선거를 하나씩 처리하고 저장하는 함수 (process_and_save_all_elections 기본 경로)
     """
     try:
         logging.info(f"데이터 처리 시작 - 선거: {list(election_list.keys())}, 기간: {start_date} ~ {end_date}")
-        election_data = load_data.load_election_data(election_list, db_path, table_name, start_date, end_date)
+        if parquet_path is not None and not stream:
+            election_data = load_data.load_election_parquet(election_list, parquet_path, start_date, end_date, columns='sale',
+                                                            filters=filters)
+        elif not stream:
+            election_data = load_data.load_election_data(election_list, db_path, table_name, start_date, end_date, columns='sale',
+                                                         filters=filters)
         results = {}
         folder = create_folder()
         
         for election_name, election_date in election_list.items():
             logging.info(f"{election_name} 처리 시작...")
-            result = process_election_data(election_data, election_name, election_date, region_unit)
+            if stream:
+                result = process_election_streaming(election_name, election_date, db_path, table_name, start_date, end_date,
+                                                    region_unit, chunksize, filters=filters)
+            else:
+                result = process_election_data(election_data, election_name, election_date, region_unit,
+                                               keep_intermediates=keep_intermediates, memory_budget_mb=memory_budget_mb)
             
             if result is None:
                 logging.error(f"{election_name} 처리 실패")
                 continue
                 
-            results[election_name] = {
-                'raw_data': result['raw_data'],
-                'code_election_day': result['code_election_day'],
-                'code_current': result['code_current'],
-                'code_district': result['code_district'],
-                'mapping_df': result['mapping_df'],
-                'merged_admin': result['merged_admin'],
-                'code_admin': result['code_admin'],
-                'merged_district': result['merged_district'],
-                'bdong_gini': result['bdong_gini']
-            }
-            
-            # 누락 항목 계산
-            results[election_name]['누락_선거구'] = set(results[election_name]['code_district'].district) - set(results[election_name]['merged_district'].district)
-            results[election_name]['누락_행정동코드'] = results[election_name]['code_district'][results[election_name]['code_district'].district.isin(results[election_name]['누락_선거구'])]
+            results[election_name] = build_result_entry(result)
             
             logging.info(f"{election_name} 처리 완료")
             logging.info(f"{election_name} 저장 시작...")
@@ -256,4 +644,45 @@ def process_and_save_all_elections(election_list, db_path, table_name, start_dat
         
     except Exception as e:
         logging.error(f"데이터 처리 중 오류 발생: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+def process_rolling_gini(election_name, election_date, db_path, table_name, start_date, end_date,
+                         window_days=365, freq='D', region_unit='시군구', value_col='거래금액'):
+    """
+    기준일별 '최근 window_days일' 지니계수 시계열을 계산하는 함수
+
+    첫 기준일의 창 시작부터 마지막 기준일까지를 한 번만 로드/전처리/매핑한 뒤
+    시간순 한 번의 스캔으로 모든 기준일, 모든 지역의 지니계수를 계산한다.
+
+    Parameters:
+        election_name (str): 선거 이름 (법정동/선거구 매핑 파일 선택용)
+        election_date (str): 선거 날짜 (YYMMDD 형식)
+        start_date, end_date (str | datetime): 첫/마지막 기준일 (YYMMDD 형식 문자열 또는 datetime)
+        window_days (int): 창 길이 (일)
+        freq (str): 기준일 간격 ('D' 일별, 'MS' 월초 등)
+        region_unit (str): 지역 단위 ('시군구', '읍면동', '선거구')
+        value_col (str): 지니계수를 계산할 컬럼 ('거래금액' 또는 '평당거래금액')
+
+    Returns:
+        pd.DataFrame: 지역, 기준일자, 거래수, 지니계수
+    """
+    from datetime import datetime, timedelta
+
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, '%y%m%d')
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date, '%y%m%d')
+    load_start = start_date - timedelta(days=window_days)
+
+    logging.info(f"롤링 지니계수 처리 시작 - 선거: {election_name}, 기준일: {start_date:%Y-%m-%d} ~ {end_date:%Y-%m-%d}, 창: {window_days}일")
+    election_data = load_data.load_election_data({election_name: election_date}, db_path, table_name, load_start, end_date, columns='sale')
+    result = process_election_data(election_data, election_name, election_date, region_unit)
+    if result is None:
+        logging.error(f"{election_name} 처리 실패")
+        return None
+
+    series = rolling_gini.rolling_gini(result['merged_district'], get_region_column(region_unit), value_col,
+                                       window_days=window_days, freq=freq,
+                                       start_date=start_date, end_date=end_date)
+    logging.info(f"롤링 지니계수 처리 완료: {series.shape}")
+    return series
@@ -1,8 +1,7 @@
 import pandas as pd
 import logging
-from source import calculate_gini, load_data, preprocess
+from source import calculate_gini, load_data, preprocess, code_tables
 import os
-import PublicDataReader as pdr
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -22,21 +21,18 @@ def process_election_data(df: pd.DataFrame, region_unit: str) -> dict:
 
         if region_unit == '시군구':
             data['지역코드'] = data['지역코드'].astype(str).str.zfill(5)
-            code_bdong = pdr.code_bdong()[["시군구코드", "시군구명", "시도명"]].drop_duplicates("시군구코드")
-            code_bdong.columns = code_bdong.columns.str.strip()
-            code_bdong['시군구코드'] = code_bdong['시군구코드'].astype(str).str.zfill(5)
-            merged = data.merge(code_bdong, how='left', left_on='지역코드', right_on='시군구코드')
+            # 시군구코드는 코드표 레지스트리에서 5자리로 정규화됨
+            code_bdong = code_tables.code_bdong()[["시군구코드", "시군구명", "시도명"]].drop_duplicates("시군구코드")
+            # 시도_시군구 라벨은 코드표(시군구 수)에서 만들고 범주형(정수 코드)으로 거래에 붙임
+            code_bdong['시도_시군구'] = calculate_gini.combine_labels(code_bdong, ['시도명', '시군구명'], strip=True)
+            merged = data.merge(code_bdong[["시군구코드", "시군구명", "시도명", "시도_시군구"]],
+                                how='left', left_on='지역코드', right_on='시군구코드')
             logging.info(f"[LEASE] 병합 후 컬럼: {list(merged.columns)}")
-            group_col = None
-            if '시도명_y' in merged.columns and '시군구명' in merged.columns:
-                merged['시도_시군구'] = (merged['시도명_y'].fillna('') + '_' + merged['시군구명'].fillna('')).str.strip('_')
-                group_col = '시도_시군구'
-            elif '시군구명' in merged.columns:
-                group_col = '시군구명'
-            elif '시군구코드' in merged.columns:
-                group_col = '시군구코드'
-            else:
-                group_col = '지역코드'
+            # 코드표에 없는 지역코드는 빈 라벨('')로 묶음
+            if merged['시도_시군구'].isna().any():
+                categories = sorted(set(merged['시도_시군구'].cat.categories) | {''})
+                merged['시도_시군구'] = merged['시도_시군구'].cat.set_categories(categories).fillna('')
+            group_col = '시도_시군구'
 
             logging.info(f"지니계수 계산 시작 - 지역 단위: {group_col}")
             gini_calculator = calculate_gini.GiniCalculator(merged)
@@ -45,14 +41,12 @@ def process_election_data(df: pd.DataFrame, region_unit: str) -> dict:
         elif region_unit == '법정동':
             # 법정동에 시군구명을 붙여서 구분하기 위해 지역코드로 시군구명 매핑
             data['지역코드'] = data['지역코드'].astype(str).str.zfill(5)
-            code_bdong = pdr.code_bdong()[["시군구코드", "시군구명", "시도명"]].drop_duplicates("시군구코드")
-            code_bdong.columns = code_bdong.columns.str.strip()
-            code_bdong['시군구코드'] = code_bdong['시군구코드'].astype(str).str.zfill(5)
+            code_bdong = code_tables.code_bdong()[["시군구코드", "시군구명", "시도명"]].drop_duplicates("시군구코드")
             merged = data.merge(code_bdong, how='left', left_on='지역코드', right_on='시군구코드')
             
             # 법정동명 정리 및 시군구명_법정동 형태로 결합
             merged['법정동'] = merged['법정동'].astype(str).str.strip()
-            merged['시군구명_법정동'] = (merged['시군구명'].fillna('') + '_' + merged['법정동'].fillna('')).str.strip('_')
+            merged['시군구명_법정동'] = calculate_gini.combine_labels(merged, ['시군구명', '법정동'], strip=True)
             
             logging.info(f"[LEASE] 법정동 매핑 후 컬럼: {list(merged.columns)}")
             logging.info(f"[LEASE] 시군구명_법정동 샘플: {merged['시군구명_법정동'].head().tolist()}")
@@ -115,13 +109,15 @@ def save_results(results, election_name, region_unit, directory, start_date=None
         logging.error(f"전월세 결과 저장 중 오류 발생: {str(e)}")
         raise
 
-def process_and_save_all_elections(election_list, db_path, table_name, start_date=None, end_date=None, region_unit='시군구'):
+def process_and_save_all_elections(election_list, db_path, table_name, start_date=None, end_date=None, region_unit='시군구', filters=None):
     """
     모든 선거 데이터를 처리하고 저장하는 함수
+    filters는 DB 조회 조건으로 전달됨 (load_data.compile_filters 참조)
     """
     try:
         logging.info(f"데이터 처리 시작 - 선거: {list(election_list.keys())}, 기간: {start_date} ~ {end_date}")
-        election_data = load_data.load_election_data(election_list, db_path, table_name, start_date, end_date)
+        election_data = load_data.load_election_data(election_list, db_path, table_name, start_date, end_date, columns='lease',
+                                                     filters=filters)
         results = {}
         folder = create_folder()
         
@@ -0,0 +1,204 @@
+import os
+import logging
+
+import numpy as np
+
+
+class NumpyBackend:
+    """
+    순수 NumPy 기준(reference) 백엔드
+    """
+    name = 'numpy'
+
+    def gini(self, array):
+        array = array.flatten().astype(float)  # 1차원 배열로 만들기 + 실수형으로
+        if np.amin(array) < 0:
+            array -= np.amin(array)  # 음수 값은 불가
+        array += 0.0000001  # 0 방지
+        array = np.sort(array)  # 거래 값을 정렬
+        index = np.arange(1, array.shape[0] + 1)  # 각 배열에 인덱스 부여
+        n = array.shape[0]
+        return ((np.sum((2 * index - n - 1) * array)) / (n * np.sum(array)))
+
+    def segment_gini(self, keys, vals, counts, starts):
+        # 구간 내 순위(1..n)와 구간 크기로 sum((2i - n - 1) * x) / (n * sum(x)) 계산
+        n_segments = counts.shape[0]
+        n = counts[keys]
+        index = np.arange(vals.shape[0]) - starts[keys] + 1
+        numer = np.bincount(keys, weights=(2 * index - n - 1) * vals, minlength=n_segments)
+        total = np.bincount(keys, weights=vals, minlength=n_segments)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return numer / (counts * total)
+
+    def segment_weighted_gini(self, keys, vals, weights, counts, starts):
+        # sum(w * x * (2C - w - W)) / (W * sum(w * x))
+        # (C: 구간 내 누적 가중치, W: 구간 가중치 합, 가중치가 모두 1이면 비가중 식과 같음)
+        n_segments = counts.shape[0]
+        total_w = np.bincount(keys, weights=weights, minlength=n_segments)
+        cum_w = np.cumsum(weights)
+        cum_w -= np.concatenate(([0.0], np.cumsum(total_w)[:-1]))[keys]
+        wx = weights * vals
+        numer = np.bincount(keys, weights=wx * (2 * cum_w - weights - total_w[keys]), minlength=n_segments)
+        total_wx = np.bincount(keys, weights=wx, minlength=n_segments)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return numer / (total_w * total_wx)
+
+
+class NumbaBackend:
+    """
+    Numba JIT 백엔드 (구간 단위 병렬 루프, numba 미설치 시 생성 불가)
+    """
+    name = 'numba'
+
+    def __init__(self):
+        import numba
+
+        @numba.njit(cache=True)
+        def gini(array):
+            array = array.flatten().astype(np.float64)
+            low = array.min()
+            if low < 0:
+                array = array - low
+            array = np.sort(array + 0.0000001)
+            n = array.shape[0]
+            numer = 0.0
+            total = 0.0
+            for i in range(n):
+                numer += (2 * (i + 1) - n - 1) * array[i]
+                total += array[i]
+            return numer / (n * total)
+
+        @numba.njit(parallel=True, cache=True)
+        def segment_gini(vals, counts, starts):
+            out = np.empty(counts.shape[0])
+            for s in numba.prange(counts.shape[0]):
+                n = counts[s]
+                start = starts[s]
+                numer = 0.0
+                total = 0.0
+                for i in range(n):
+                    x = vals[start + i]
+                    numer += (2 * (i + 1) - n - 1) * x
+                    total += x
+                out[s] = numer / (n * total) if n > 0 else np.nan
+            return out
+
+        @numba.njit(parallel=True, cache=True)
+        def segment_weighted_gini(vals, weights, counts, starts):
+            out = np.empty(counts.shape[0])
+            for s in numba.prange(counts.shape[0]):
+                start = starts[s]
+                end = start + counts[s]
+                total_w = 0.0
+                for i in range(start, end):
+                    total_w += weights[i]
+                cum_w = 0.0
+                numer = 0.0
+                total_wx = 0.0
+                for i in range(start, end):
+                    w = weights[i]
+                    cum_w += w
+                    numer += w * vals[i] * (2 * cum_w - w - total_w)
+                    total_wx += w * vals[i]
+                denom = total_w * total_wx
+                out[s] = numer / denom if denom != 0 else np.nan
+            return out
+
+        self._gini = gini
+        self._segment_gini = segment_gini
+        self._segment_weighted_gini = segment_weighted_gini
+
+    def gini(self, array):
+        return self._gini(np.asarray(array, dtype=float))
+
+    def segment_gini(self, keys, vals, counts, starts):
+        return self._segment_gini(vals, counts.astype(np.int64), starts.astype(np.int64))
+
+    def segment_weighted_gini(self, keys, vals, weights, counts, starts):
+        return self._segment_weighted_gini(vals, weights, counts.astype(np.int64), starts.astype(np.int64))
+
+
+# 이름 -> 백엔드 클래스 (우선순위 순, 'auto'는 사용 가능한 첫 백엔드)
+BACKENDS = {
+    'numba': NumbaBackend,
+    'numpy': NumpyBackend,
+}
+REFERENCE = 'numpy'
+_instances = {}
+
+
+def register_backend(name, backend_cls, before=REFERENCE):
+    """
+    새 백엔드 클래스를 등록 (gini, segment_gini, segment_weighted_gini 메서드 필요)
+
+    before로 준 백엔드 바로 앞 순위에 넣는다 (기본값: NumPy 기준 백엔드 앞이라 'auto'에서 선택될 수 있음).
+    before=None이면 맨 뒤에 넣는다.
+    """
+    if before is not None and before not in BACKENDS:
+        raise ValueError(f"알 수 없는 지니계수 백엔드: {before}")
+    order = [key for key in BACKENDS if key != name]
+    order.insert(order.index(before) if before is not None else len(order), name)
+    classes = dict(BACKENDS, **{name: backend_cls})
+    BACKENDS.clear()
+    BACKENDS.update((key, classes[key]) for key in order)
+    # 'auto'의 선택 결과도 다시 계산
+    _instances.pop(name, None)
+    _instances.pop('auto', None)
+
+
+def verify_backend(backend, reference=None, n_rows=20000, n_groups=50, seed=0, rtol=1e-9):
+    """
+    백엔드 결과가 기준 백엔드와 수치적으로 같은지 무작위 데이터로 확인하는 함수
+    """
+    reference = reference or NumpyBackend()
+    rng = np.random.default_rng(seed)
+    vals = rng.lognormal(10, 1, n_rows)
+    weights = rng.uniform(0.5, 2.0, n_rows)
+    counts = np.bincount(rng.integers(0, n_groups, n_rows), minlength=n_groups + 1)  # 마지막 구간은 빈 구간
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    keys = np.repeat(np.arange(counts.shape[0]), counts)
+    vals = vals[np.lexsort((vals, keys))]
+
+    checks = [
+        (backend.gini(vals[:1000]), reference.gini(vals[:1000])),
+        (backend.segment_gini(keys, vals, counts, starts), reference.segment_gini(keys, vals, counts, starts)),
+        (backend.segment_weighted_gini(keys, vals, weights, counts, starts),
+         reference.segment_weighted_gini(keys, vals, weights, counts, starts)),
+    ]
+    return all(np.allclose(a, b, rtol=rtol, equal_nan=True) for a, b in checks)
+
+
+def get_backend(name=None):
+    """
+    지니계수 계산 백엔드를 반환하는 함수
+
+    name이 없으면 GINI_BACKEND 환경변수(기본값 'auto')를 사용한다. 'auto'는 설치된
+    가장 빠른 백엔드를 고른다. 선택적 의존성이 없거나 기준 백엔드와 결과가 다르면
+    경고를 남기고 NumPy 백엔드로 대체한다. 백엔드는 프로세스당 한 번만 생성/검증한다.
+    """
+    name = (name or os.getenv('GINI_BACKEND', 'auto')).lower()
+    if name in _instances:
+        return _instances[name]
+    candidates = list(BACKENDS) if name == 'auto' else [name]
+
+    for candidate in candidates:
+        if candidate not in BACKENDS:
+            logging.warning(f"알 수 없는 지니계수 백엔드: {candidate}, {REFERENCE} 백엔드를 사용합니다")
+            continue
+        try:
+            backend = BACKENDS[candidate]()
+        except ImportError as e:
+            if name != 'auto':
+                logging.warning(f"{candidate} 백엔드를 사용할 수 없음 ({e}), {REFERENCE} 백엔드를 사용합니다")
+            continue
+        if candidate != REFERENCE and not verify_backend(backend):
+            logging.warning(f"{candidate} 백엔드 결과가 {REFERENCE} 백엔드와 다름, {REFERENCE} 백엔드를 사용합니다")
+            continue
+        logging.info(f"지니계수 백엔드: {candidate}")
+        _instances[candidate] = _instances[name] = backend
+        return backend
+
+    if REFERENCE not in _instances:
+        _instances[REFERENCE] = BACKENDS[REFERENCE]()
+    _instances[name] = _instances[REFERENCE]
+    return _instances[REFERENCE]
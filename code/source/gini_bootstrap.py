@@ -0,0 +1,151 @@
+import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+
+def _prepare(x):
+    # GiniCalculator.gini와 같은 보정: 음수면 최솟값만큼 이동, 0 방지
+    x = np.asarray(x, dtype=float)
+    if x.min() < 0:
+        x = x - x.min()
+    return np.sort(x + 0.0000001)
+
+
+def _gini_rows(samples):
+    """
+    (복제 수, n) 배열의 행별 지니계수
+    """
+    samples = np.sort(samples, axis=1)
+    n = samples.shape[1]
+    index = np.arange(1, n + 1)
+    return ((2 * index - n - 1) * samples).sum(axis=1) / (n * samples.sum(axis=1))
+
+
+def _jackknife(x):
+    """
+    정렬된 x에서 한 개씩 뺀 n개의 지니계수 (누적합으로 O(n))
+    """
+    n = x.shape[0]
+    index = np.arange(1, n + 1)
+    total = x.sum()
+    rank_sum = (index * x).sum()
+    above = total - np.cumsum(x)  # k번째보다 뒤에 있는 값의 합
+    m = n - 1
+    rank_sum_k = rank_sum - index * x - above
+    total_k = total - x
+    return (2 * rank_sum_k - (m + 1) * total_k) / (m * total_k)
+
+
+def _bootstrap_group(x, n_boot, level, seed_seq, max_cells):
+    """
+    한 그룹의 (지니계수, 백분위 하한/상한, BCa 하한/상한)
+    """
+    x = _prepare(x)
+    n = x.shape[0]
+    theta = _gini_rows(x[None, :])[0]
+    if n < 2:
+        return theta, np.nan, np.nan, np.nan, np.nan
+
+    # 복제를 2차원 배열 단위로 생성 (한 번에 max_cells 이하)
+    rng = np.random.default_rng(seed_seq)
+    batch = max(1, min(n_boot, max_cells // n))
+    boot = np.empty(n_boot)
+    for start in range(0, n_boot, batch):
+        size = min(batch, n_boot - start)
+        boot[start:start + size] = _gini_rows(x[rng.integers(0, n, size=(size, n))])
+
+    alpha = (1 - level) / 2
+    pct_lo, pct_hi = np.quantile(boot, [alpha, 1 - alpha])
+
+    # BCa: 편향 보정 z0, 가속 a (잭나이프)
+    normal = NormalDist()
+    prop = np.clip((boot < theta).mean(), 1 / (n_boot + 1), n_boot / (n_boot + 1))
+    z0 = normal.inv_cdf(prop)
+    jack = _jackknife(x)
+    d = jack.mean() - jack
+    denom = 6 * (d ** 2).sum() ** 1.5
+    a = (d ** 3).sum() / denom if denom > 0 else 0.0
+    bca = []
+    for q in (alpha, 1 - alpha):
+        z = normal.inv_cdf(q)
+        bca.append(normal.cdf(z0 + (z0 + z) / (1 - a * (z0 + z))))
+    bca_lo, bca_hi = np.quantile(boot, bca)
+    return theta, pct_lo, pct_hi, bca_lo, bca_hi
+
+
+def _bootstrap_task(task):
+    # 프로세스 풀 작업 단위: [(결과 위치, 값 배열, SeedSequence), ...]
+    items, n_boot, level, max_cells = task
+    return [(pos, _bootstrap_group(x, n_boot, level, seed_seq, max_cells)) for pos, x, seed_seq in items]
+
+
+def bootstrap_ci(codes, values, n_groups, n_boot=1000, level=0.95, seed=None, n_jobs=None, max_cells=5_000_000):
+    """
+    그룹별 지니계수의 부트스트랩 신뢰구간(백분위, BCa)을 계산하는 함수
+
+    그룹마다 복제 표본을 (복제 수 x 거래수) 2차원 배열로 한 번에 만들어 행별로 지니계수를
+    계산하고, 그룹들을 묶어 프로세스 풀에 분배한다. 난수는 SeedSequence(seed)에서
+    (컬럼, 그룹)별로 파생하므로 작업자 수와 관계없이 결과가 재현된다.
+
+    Parameters:
+        codes (np.ndarray): 행별 그룹코드 (0 ~ n_groups-1, 음수는 제외)
+        values (np.ndarray): 값 배열 (행 수) 또는 (행 수, 컬럼 수)
+        n_groups (int): 그룹 수
+        n_boot (int): 복제 수
+        level (float): 신뢰수준
+        seed (int): 난수 시드
+        n_jobs (int): 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 계산, 2 이상은 spawn 방식이므로
+            스크립트에서 호출할 때는 if __name__ == "__main__": 아래에서 실행)
+        max_cells (int): 한 번에 생성하는 복제 배열의 최대 원소 수
+
+    Returns:
+        np.ndarray: (n_groups, 4) 또는 (n_groups, 컬럼 수, 4) - 백분위 하한/상한, BCa 하한/상한
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    values = np.asarray(values, dtype=float)
+    single = values.ndim == 1
+    if single:
+        values = values[:, None]
+    n_cols = values.shape[1]
+
+    # 그룹코드 기준으로 한 번 정렬해 그룹별 배열로 분할
+    valid = codes >= 0
+    order = np.argsort(codes[valid], kind='stable')
+    sorted_codes = codes[valid][order]
+    sorted_values = values[valid][order]
+    bounds = np.searchsorted(sorted_codes, np.arange(n_groups + 1))
+
+    seeds = np.random.SeedSequence(seed).spawn(n_groups * n_cols)
+    items = []
+    for col in range(n_cols):
+        for g in range(n_groups):
+            x = sorted_values[bounds[g]:bounds[g + 1], col]
+            if x.shape[0] == 0 or np.isnan(x).any():
+                continue
+            items.append((col * n_groups + g, x, seeds[col * n_groups + g]))
+
+    result = np.full((n_cols * n_groups, 4), np.nan)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    logging.info(f"부트스트랩 시작 - 그룹 {len(items)}개, 복제 {n_boot}회, 프로세스 {n_jobs}개")
+
+    # 큰 그룹부터 작업 묶음에 번갈아 배정해 부하를 고르게
+    items.sort(key=lambda item: -item[1].shape[0])
+    n_tasks = min(len(items), n_jobs * 4) or 1
+    tasks = [(items[i::n_tasks], n_boot, level, max_cells) for i in range(n_tasks)]
+    if n_jobs == 1:
+        outputs = list(map(_bootstrap_task, tasks))
+    else:
+        # fork는 Numba 스레드 풀 등 이미 시작된 스레드를 복제해 종료 시 멈출 수 있으므로 spawn 사용
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context('spawn')) as executor:
+            outputs = list(executor.map(_bootstrap_task, tasks))
+    for output in outputs:
+        for pos, (theta, *ci) in output:
+            result[pos] = ci
+
+    logging.info("부트스트랩 완료")
+    result = result.reshape(n_cols, n_groups, 4).transpose(1, 0, 2)
+    return result[:, 0, :] if single else result
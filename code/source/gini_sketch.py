@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import logging
+
+
+class GiniSketch:
+    """
+    지역별 거래금액 분포를 로그 버킷 분위수 스케치로 요약하는 클래스 (DDSketch 방식)
+
+    각 값은 상대오차 relative_accuracy 이내의 대표값을 갖는 버킷에 카운트되므로
+    원본 거래를 보관하지 않아도 되고, 메모리는 (지역 수 x 버킷 수)로 제한된다.
+    같은 relative_accuracy로 만든 스케치끼리는 버킷 카운트를 더해 병합할 수 있어
+    청크/월 단위로 만든 스케치를 합쳐 긴 기간의 지니계수를 근사할 수 있다.
+    """
+    ZERO_BUCKET = np.iinfo(np.int64).min  # 0 이하 값 버킷 (대표값 0)
+
+    def __init__(self, relative_accuracy=0.005):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy는 0과 1 사이여야 합니다: {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.counts = pd.Series(dtype='int64', index=pd.MultiIndex.from_arrays([[], []], names=['지역', '버킷']))
+
+    def update(self, regions, values):
+        """
+        지역/값 배열을 스케치에 추가 (결측 지역/값은 제외)
+        """
+        values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+        regions = pd.Series(regions).reset_index(drop=True)
+        valid = ~np.isnan(values) & regions.notna().to_numpy()
+        values = values[valid]
+        if (values < 0).any():
+            raise ValueError("근사 모드는 음수 값을 지원하지 않습니다")
+
+        buckets = np.full(values.shape[0], self.ZERO_BUCKET, dtype=np.int64)
+        positive = values > 0
+        buckets[positive] = np.ceil(np.log(values[positive]) / np.log(self.gamma)).astype(np.int64)
+
+        chunk_counts = pd.DataFrame({'지역': regions[valid].to_numpy(), '버킷': buckets}).value_counts()
+        self.counts = pd.concat([self.counts, chunk_counts]).groupby(level=['지역', '버킷']).sum()
+        return self
+
+    def merge(self, other):
+        """
+        같은 정확도의 다른 스케치를 병합
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("relative_accuracy가 다른 스케치는 병합할 수 없습니다")
+        self.counts = pd.concat([self.counts, other.counts]).groupby(level=['지역', '버킷']).sum()
+        return self
+
+    def representatives(self, buckets):
+        """
+        버킷 번호의 대표값 (해당 버킷 값과의 상대오차가 relative_accuracy 이내)
+        """
+        buckets = np.asarray(buckets, dtype=np.int64)
+        reps = np.zeros(buckets.shape[0])
+        positive = buckets != self.ZERO_BUCKET
+        reps[positive] = 2 * self.gamma ** buckets[positive].astype(float) / (self.gamma + 1)
+        return reps
+
+    def error_bound(self, gini):
+        """
+        근사 지니계수의 최대 오차
+
+        모든 값이 상대오차 a 이내로 대표값에 대응되면 b = a / (1 - a)에 대해
+        |G - G'| <= b * (1 + G') / (1 - b) 가 성립한다.
+        """
+        b = self.relative_accuracy / (1 - self.relative_accuracy)
+        return b * (1 + np.asarray(gini)) / (1 - b)
+
+    def gini(self):
+        """
+        지역별 근사 지니계수 계산
+
+        Returns:
+            pd.DataFrame: 지역, 거래수, 지니계수, 오차한계
+        """
+        counts = self.counts.sort_index()
+        regions = counts.index.get_level_values('지역')
+        codes, labels = pd.factorize(regions)
+        weights = counts.to_numpy(dtype=float)
+        reps = self.representatives(counts.index.get_level_values('버킷').to_numpy())
+
+        # 지역 내 버킷은 대표값 오름차순으로 정렬되어 있음 (0 버킷이 가장 앞)
+        n_groups = len(labels)
+        total_w = np.bincount(codes, weights=weights, minlength=n_groups)
+        total_wx = np.bincount(codes, weights=weights * reps, minlength=n_groups)
+        cum_w = np.cumsum(weights)
+        group_start = np.concatenate(([0.0], np.cumsum(total_w)[:-1]))
+        cum_w -= group_start[codes]
+
+        # sum(w * x * (2C - w - W)) / (W * sum(w * x))
+        numer = np.bincount(codes, weights=weights * reps * (2 * cum_w - weights - total_w[codes]), minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            gini = numer / (total_w * total_wx)
+
+        return pd.DataFrame({
+            '지역': labels,
+            '거래수': total_w.astype(np.int64),
+            '지니계수': gini,
+            '오차한계': self.error_bound(gini),
+        })
+
+
+def sketch_from_chunks(chunks, region_col, value_col, relative_accuracy=0.005):
+    """
+    데이터프레임 청크(또는 월별 데이터)를 순회하며 하나의 스케치로 병합하는 함수
+
+    Parameters:
+        chunks (iterable): region_col, value_col을 포함하는 DataFrame들
+        region_col (str): 지역 컬럼
+        value_col (str): 값 컬럼
+        relative_accuracy (float): 버킷 상대오차
+
+    Returns:
+        GiniSketch: 병합된 스케치
+    """
+    sketch = GiniSketch(relative_accuracy)
+    for i, chunk in enumerate(chunks):
+        sketch.update(chunk[region_col], chunk[value_col])
+        logging.info(f"스케치 청크 {i} 반영: {len(chunk)}행, 버킷 {len(sketch.counts)}개")
+    return sketch
@@ -1,102 +1,340 @@
 import sqlite3
+import logging
+import operator
+import functools
 import pandas as pd
-from sqlalchemy import create_engine
+from source import schema as table_schema, db_pool, db_writer
 class DataLoader:
     def __init__(self, db_path):
         self.db_path = db_path
 
-    def load_data(self, table_name, nrow):
+    def load_data(self, table_name, nrow=None, columns=None):
+        """
+        테이블을 불러오는 함수 (nrow가 주어지면 앞에서부터 nrow행만)
+        """
         try:
-            eng = create_engine(f"sqlite:///{self.db_path}")
-            with eng.connect()as conn:
-                query = f"SELECT * FROM {table_name}"
-                df = pd.read_sql_query(sql = query, con = conn)
+            with db_pool.connect(self.db_path) as conn:
+                schema = table_schema.get_schema(columns)
+                select = table_schema.select_clause(schema, table_columns(conn, table_name))
+                query = f"SELECT {select} FROM {table_name}"
+                params = ()
+                if nrow is not None:
+                    query += " LIMIT ?"
+                    params = (int(nrow),)
+                df = table_schema.apply_schema(pd.read_sql_query(sql = query, con = conn, params = params), schema)
         except Exception as e :
             print(f"{table_name}에서 {e} 발생")
             df = pd.DataFrame()
-        finally :
-            conn.close()
         return df
+
+    def load_page(self, table_name, after_rowid=0, page_size=10000, columns=None):
+        """
+        rowid 기준 키셋 페이지 조회 (OFFSET 없이 rowid 인덱스로 바로 다음 페이지 위치를 찾음)
+
+        Returns:
+            tuple: (데이터프레임, 다음 페이지 after_rowid - 마지막 페이지면 None)
+        """
+        with db_pool.connect(self.db_path) as conn:
+            schema = table_schema.get_schema(columns)
+            select = table_schema.select_clause(schema, table_columns(conn, table_name))
+            query = f"SELECT rowid AS _rowid, {select} FROM {table_name} WHERE rowid > ? ORDER BY rowid LIMIT ?"
+            df = pd.read_sql_query(query, conn, params=(int(after_rowid), int(page_size)))
+        next_rowid = int(df['_rowid'].iloc[-1]) if len(df) == page_size else None
+        return table_schema.apply_schema(df.drop(columns=['_rowid']), schema), next_rowid
+
+    def iter_pages(self, table_name, page_size=10000, columns=None):
+        """
+        테이블 전체를 page_size행씩 차례로 반환하는 제너레이터 (load_page 반복)
+        """
+        after_rowid = 0
+        while after_rowid is not None:
+            df, after_rowid = self.load_page(table_name, after_rowid, page_size, columns)
+            if len(df):
+                yield df
+
+    def sample_strata(self, table_name):
+        """
+        층화 표본의 기본 층: 시군구 코드 컬럼과 년
+        """
+        columns = self.get_table_columns(table_name)['name'].tolist()
+        region_col = '지역코드' if '지역코드' in columns else '법정동시군구코드'
+        return [region_col, '년']
+
+    def build_sample_table(self, table_name, per_stratum=200, strata=None, seed=0):
+        """
+        층(기본: 시군구 x 년)별 무작위 표본 테이블 {table_name}_sample을 DB에 만드는 함수
+
+        행마다 (seed, rowid)의 blake2b 해시를 정렬 키로 ROW_NUMBER()를 매겨 층별 앞에서부터
+        per_stratum행을 저장한다. 같은 seed면 항상 같은 표본이 만들어지고, sample_rank가
+        작은 행만 고르면 더 작은 무작위 표본이 된다. 데이터가 바뀌면 다시 실행한다.
+        """
+        import hashlib
+
+        strata = strata or self.sample_strata(table_name)
+        sample_table = f"{table_name}_sample"
+
+        def sample_hash(rowid):
+            digest = hashlib.blake2b(f"{seed}:{rowid}".encode(), digest_size=8).digest()
+            return int.from_bytes(digest, 'big', signed=True)
+
+        # 읽기 전용(immutable) 풀은 쓰기 전에 retire (db_pool.writing)
+        with db_pool.writing(self.db_path):
+            self._write_sample_table(table_name, sample_table, strata, per_stratum, sample_hash)
+
+    def _write_sample_table(self, table_name, sample_table, strata, per_stratum, sample_hash):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.create_function('sample_hash', 1, sample_hash, deterministic=True)
+            partition = ', '.join(strata)
+            with conn:
+                conn.execute(f"DROP TABLE IF EXISTS {sample_table}")
+                conn.execute(f'''
+                    CREATE TABLE {sample_table} AS
+                    SELECT * FROM (
+                        SELECT t.*, t.rowid AS source_rowid,
+                               ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY sample_hash(t.rowid)) AS sample_rank
+                        FROM {table_name} t
+                    )
+                    WHERE sample_rank <= ?
+                ''', (int(per_stratum),))
+                conn.execute(f"CREATE INDEX idx_{sample_table}_strata ON {sample_table}({partition}, sample_rank)")
+            n_rows = conn.execute(f"SELECT COUNT(*) FROM {sample_table}").fetchone()[0]
+            print(f"{sample_table} 생성: {n_rows}행 (층: {strata}, 층별 최대 {per_stratum}행)")
+        finally:
+            conn.close()
+
+    def load_sample(self, table_name, per_stratum=None, columns=None, filters=None):
+        """
+        미리 만든 표본 테이블에서 층화 무작위 표본을 불러오는 함수
+
+        Parameters:
+            per_stratum (int): 층별 최대 행 수 (None이면 표본 테이블 전체)
+            filters (dict): 조회 조건 (compile_filters 참조, 예: {'년': ['2020', '2021']})
+        """
+        sample_table = f"{table_name}_sample"
+        with db_pool.connect(self.db_path) as conn:
+            sample_columns = table_columns(conn, sample_table)
+            schema = table_schema.get_schema(columns)
+            select = table_schema.select_clause(schema, sample_columns)
+            where, params = compile_filters(filters, sample_columns)
+            if per_stratum is not None:
+                where = ' AND '.join(filter(None, [where, 'sample_rank <= ?']))
+                params += (int(per_stratum),)
+            query = f"SELECT {select} FROM {sample_table}" + (f" WHERE {where}" if where else '')
+            df = pd.read_sql_query(query, conn, params=params)
+        return table_schema.apply_schema(df, schema)
     
 
-    def save_data(self, data, table_name) :
+    def save_data(self, data, table_name, key_cols=None, indexes=()) :
         '''
         데이트 프레임을 db의 테이블에 저장해주는 함수
+        key_cols가 없으면 테이블을 새로 만들고, 있으면 키가 같은 행을 갱신(upsert)한다 (db_writer.bulk_write)
+        기본 RangeIndex가 아닌 인덱스는 to_sql처럼 컬럼으로 저장하고 (이름이 없으면 'index'),
+        기본 RangeIndex는 더 이상 'index' 컬럼으로 저장하지 않는다
         '''
         try :
-            conn = sqlite3.connect(self.db_path)
-            data.to_sql(table_name, conn, if_exists = 'replace')
+            if not isinstance(data.index, pd.RangeIndex):
+                data = data.reset_index()
+            db_writer.bulk_write(self.db_path, data, table_name, key_cols=key_cols,
+                                 if_exists='upsert' if key_cols else 'replace', indexes=indexes)
         except Exception as e :
             print(f"{e}")
-        finally :
-            conn.close()
 
 
     def get_table_names(self):
         try :
-            conn = sqlite3.connect(self.db_path)
-            query = "SELECT name from sqlite_master WHERE type = 'table'"
-            tables = pd.read_sql(query, conn)
+            with db_pool.connect(self.db_path) as conn:
+                query = "SELECT name from sqlite_master WHERE type = 'table'"
+                tables = pd.read_sql(query, conn)
         except Exception as e :
             print(e)
-            tables = pd.DataFrame()
-        finally : conn.close()
+            tables = pd.DataFrame(columns=['name'])
         return tables['name'].tolist()
 
     def get_table_columns(self, table_name):
         try :
-            conn = sqlite3.connect(self.db_path)
-            query = f"PRAGMA table_info({table_name})"
-            columns = pd.read_sql(query, conn)
+            with db_pool.connect(self.db_path) as conn:
+                query = f"PRAGMA table_info({table_name})"
+                columns = pd.read_sql(query, conn)
         except Exception as e :
             print(e)
-            tables = pd.DataFrame()
-        finally : conn.close()
+            columns = pd.DataFrame(columns=['name', 'type'])
         return columns[['name', 'type']]
     
 
-def load_election_data(election_list, db_path, table_name, start_date=None, end_date=None):
+# 년/월/일 컬럼으로 만든 거래일자 (YYYY-MM-DD)
+DEAL_DATE_EXPR = '''date(년 || '-' || 
+               CASE WHEN length(월) = 1 THEN '0' || 월 ELSE 월 END || '-' || 
+               CASE WHEN length(일) = 1 THEN '0' || 일 ELSE 일 END)'''
+
+
+def get_election_window(election_date, start_date=None, end_date=None):
+    """
+    선거별 조회 기간 (YYYY-MM-DD 문자열 시작일, 종료일)을 계산하는 함수
+    start_date/end_date가 없으면 선거일 1년 전 ~ 선거일
+    """
     from datetime import datetime, timedelta
-    # DB 엔진 연결
-    eng = create_engine(f"sqlite:///{db_path}")
+    # 만약 start_date와 end_date가 None이면 선거일을 기준으로 설정
+    if start_date is None or end_date is None:
+        # 선거일을 datetime 객체로 파싱
+        calculated_end_date = datetime.strptime(election_date, '%y%m%d')
+        # 선거일 1년 전 계산
+        calculated_start_date = calculated_end_date - timedelta(days=365)
+        
+        # 날짜를 문자열로 변환
+        return calculated_start_date.strftime('%Y-%m-%d'), calculated_end_date.strftime('%Y-%m-%d')
+
+    # 입력된 start_date와 end_date가 문자열인지 확인하고 변환
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, '%y%m%d')
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date, '%y%m%d')
     
-    #쿼리 : 
-    query = f'''
-    SELECT *
-    FROM {table_name}
-    WHERE date(년 || '-' || 
-               CASE WHEN length(월) = 1 THEN '0' || 월 ELSE 월 END || '-' || 
-               CASE WHEN length(일) = 1 THEN '0' || 일 ELSE 일 END) 
-    BETWEEN date(?) AND date(?)
-    ORDER BY 년, 월, 일
-    '''
+    # datetime 객체로 변환 후 문자열로 변환
+    return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+
+
+def table_columns(conn, table_name):
+    """
+    테이블 컬럼명 목록
+    """
+    return pd.read_sql_query(f"PRAGMA table_info({table_name})", conn)['name'].tolist()
+
+
+def dedupe_clause(conn, table_name):
+    """
+    행 지문(row_fp)으로 중복 행을 DB에서 제거하는 GROUP BY 절
+
+    row_fp가 없거나 비어 있는 행이 있으면 (db_migration.add_row_fp 이후 추가된 데이터) 빈 문자열을
+    반환하고, 중복 제거는 전처리에서 한다.
+    """
+    if table_schema.ROW_FP not in table_columns(conn, table_name):
+        return ''
+    # idx_{table}_row_fp 인덱스로 바로 확인
+    if conn.execute(f"SELECT 1 FROM {table_name} WHERE {table_schema.ROW_FP} IS NULL LIMIT 1").fetchone():
+        logging.warning(f"{table_name}: 행 지문이 없는 행이 있어 DB 중복 제거를 건너뜀 (db_migration.add_row_fp 재실행 필요)")
+        return ''
+    return f"GROUP BY {table_schema.ROW_FP}"
+
+
+# 범위 필터 연산자
+FILTER_OPS = {'min': '>=', 'max': '<=', 'gt': '>', 'lt': '<'}
+
+
+def compile_filters(filters, columns):
+    """
+    구조화된 필터를 파라미터화된 SQL 조건으로 변환하는 함수
+
+    filters 예시:
+        {
+            '전용면적': {'max': 85},                        # 범위 (min/max/gt/lt)
+            '거래금액': {'min': 50000, 'max': 150000},       # 금액은 쉼표를 제거한 정수로 비교
+            '지역코드': {'prefix': ['11', '28', '41']},      # 접두사 (수도권)
+            '법정동시군구코드': ['11110', '11140'],           # 목록 (IN)
+            '아파트': {'like': '%래미안%'},                  # LIKE 패턴
+            '층': '3',                                      # 같음
+        }
+    조건은 모두 AND로 결합하고, 컬럼명은 테이블 컬럼인지 확인한다.
+
+    Returns:
+        tuple: (조건 문자열, 파라미터) - 필터가 없으면 ('', ())
+    """
+    if not filters:
+        return '', ()
+    unknown = [col for col in filters if col not in columns]
+    if unknown:
+        raise ValueError(f"테이블에 없는 필터 컬럼: {unknown}")
+
+    clauses, params = [], []
+    for col, spec in filters.items():
+        expr = table_schema.numeric_expr(col)
+        if isinstance(spec, dict):
+            for op, value in spec.items():
+                if op in FILTER_OPS:
+                    clauses.append(f"{expr} {FILTER_OPS[op]} ?")
+                    params.append(value)
+                elif op == 'in':
+                    values = list(value)
+                    clauses.append(f"{expr} IN ({', '.join(['?'] * len(values))})" if values else '0')
+                    params.extend(values)
+                elif op == 'like':
+                    clauses.append(f"{col} LIKE ?")
+                    params.append(value)
+                elif op == 'prefix':
+                    prefixes = [value] if isinstance(value, str) else list(value)
+                    clauses.append('(' + ' OR '.join([f"{col} LIKE ?"] * len(prefixes)) + ')' if prefixes else '0')
+                    params.extend(f"{prefix}%" for prefix in prefixes)
+                else:
+                    raise ValueError(f"알 수 없는 필터 연산자: {col} {op}")
+        elif isinstance(spec, (list, tuple, set)):
+            values = list(spec)
+            clauses.append(f"{expr} IN ({', '.join(['?'] * len(values))})" if values else '0')
+            params.extend(values)
+        else:
+            clauses.append(f"{expr} = ?")
+            params.append(spec)
+    return ' AND '.join(clauses), tuple(params)
+
+
+def build_date_filter(conn, table_name, intervals, filters=None):
+    """
+    기간 목록 [(시작일, 종료일), ...]에 대한 WHERE 조건을 만드는 함수
+
+    테이블에 정수 거래일자 컬럼(deal_ymd, db_migration.add_deal_ymd 참조)이 있으면
+    인덱스를 타는 범위 조건을, 없으면 년/월/일 문자열로 만든 date() 조건을 사용한다.
+    filters가 주어지면 compile_filters로 만든 조건을 AND로 붙인다.
+
+    Returns:
+        tuple: (WHERE 조건, 파라미터, ORDER BY 컬럼)
+    """
+    columns = table_columns(conn, table_name)
+    if 'deal_ymd' in columns:
+        where = ' OR '.join(['(deal_ymd BETWEEN ? AND ?)'] * len(intervals))
+        params = tuple(int(d.replace('-', '')) for interval in intervals for d in interval)
+        order_by = 'deal_ymd'
+    else:
+        where = ' OR '.join([f'({DEAL_DATE_EXPR} BETWEEN date(?) AND date(?))'] * len(intervals))
+        params = tuple(d for interval in intervals for d in interval)
+        order_by = '년, 월, 일'
+    filter_where, filter_params = compile_filters(filters, columns)
+    if filter_where:
+        where = f"({where}) AND {filter_where}"
+        params += filter_params
+    return where, params, order_by
+
+
+def load_election_data(election_list, db_path, table_name, start_date=None, end_date=None, columns=None, filters=None):
+    """
+    선거별 조회 기간의 거래 데이터를 불러오는 함수
+
+    columns에 'sale'/'lease'(schema.TABLE_SCHEMAS) 또는 {컬럼: 타입}을 주면 해당 컬럼만
+    조회하고 금액은 int32, 면적은 float64, 문자열은 (Arrow 기반) string으로 반환한다.
+    None이면 기존처럼 전체 컬럼을 그대로 반환한다.
+    filters(compile_filters 참조)는 SQL 조건으로 변환해 DB에서 걸러낸다.
+    테이블에 행 지문(row_fp)이 채워져 있으면 중복 행은 GROUP BY row_fp로 DB에서 제거된다.
+    """
+    # DB 연결 (읽기 전용 연결 풀)
+    schema = table_schema.get_schema(columns)
     
     election_dataframes = {}
-    with eng.connect() as conn:
+    with db_pool.connect(db_path) as conn:
+        select = table_schema.select_clause(schema, table_columns(conn, table_name))
+        group_by = dedupe_clause(conn, table_name)
         for election_name, election_date in election_list.items():
-            # 만약 start_date와 end_date가 None이면 선거일을 기준으로 설정
-            if start_date is None or end_date is None:
-                # 선거일을 datetime 객체로 파싱
-                calculated_end_date = datetime.strptime(election_date, '%y%m%d')
-                # 선거일 1년 전 계산
-                calculated_start_date = calculated_end_date - timedelta(days=365)
-                
-                # 날짜를 문자열로 변환
-                start_date_str = calculated_start_date.strftime('%Y-%m-%d')
-                end_date_str = calculated_end_date.strftime('%Y-%m-%d')
-            else:
-                # 입력된 start_date와 end_date가 문자열인지 확인하고 변환
-                if isinstance(start_date, str):
-                    start_date = datetime.strptime(start_date, '%y%m%d')
-                if isinstance(end_date, str):
-                    end_date = datetime.strptime(end_date, '%y%m%d')
-                
-                # datetime 객체로 변환 후 문자열로 변환
-                start_date_str = start_date.strftime('%Y-%m-%d')
-                end_date_str = end_date.strftime('%Y-%m-%d')
+            start_date_str, end_date_str = get_election_window(election_date, start_date, end_date)
+            
+            #쿼리 : 
+            where, params, order_by = build_date_filter(conn, table_name, [(start_date_str, end_date_str)], filters)
+            query = f'''
+            SELECT {select}
+            FROM {table_name}
+            WHERE {where}
+            {group_by}
+            ORDER BY {order_by}
+            '''
             
             # 데이터 불러오기
-            df = pd.read_sql_query(query, conn, params=(start_date_str, end_date_str))
+            df = table_schema.apply_schema(pd.read_sql_query(query, conn, params=params), schema)
             
             # 결과 저장
             election_dataframes[election_name] = df
@@ -105,6 +343,186 @@ def load_election_data(election_list, db_path, table_name, start_date=None, end_
             
     return election_dataframes
 
+
+def iter_election_chunks(db_path, table_name, election_date, start_date=None, end_date=None, columns=None, chunksize=200_000,
+                         filters=None):
+    """
+    선거 조회 기간의 거래 데이터를 chunksize 행 단위로 나눠 읽는 제너레이터
+
+    거래일자 순으로 읽고, 청크 마지막 거래일의 행은 다음 청크로 넘겨 같은 날짜의 거래가
+    항상 한 청크에 들어가게 한다 (청크 단위 중복 제거가 전체 중복 제거와 같도록).
+    columns, filters는 load_election_data와 같다.
+    """
+    schema = table_schema.get_schema(columns)
+    start_date_str, end_date_str = get_election_window(election_date, start_date, end_date)
+
+    with db_pool.connect(db_path) as conn:
+        select = table_schema.select_clause(schema, table_columns(conn, table_name))
+        where, params, order_by = build_date_filter(conn, table_name, [(start_date_str, end_date_str)], filters)
+        date_cols = [col.strip() for col in order_by.split(',')]
+        if schema is not None and order_by == 'deal_ymd':
+            select += ', deal_ymd'
+        query = f'''
+        SELECT {select}
+        FROM {table_name}
+        WHERE {where}
+        {dedupe_clause(conn, table_name)}
+        ORDER BY {order_by}
+        '''
+
+        carry = None
+        n_rows = 0
+        for chunk in pd.read_sql_query(query, conn, params=params, chunksize=chunksize):
+            if carry is not None:
+                chunk = pd.concat([carry, chunk], ignore_index=True)
+            # 마지막 거래일의 행은 다음 청크로
+            last = chunk[date_cols].iloc[-1]
+            tail = (chunk[date_cols] == last).all(axis=1).to_numpy()
+            carry = chunk[tail]
+            if tail.all():
+                continue
+            chunk = chunk[~tail]
+            n_rows += len(chunk)
+            yield table_schema.apply_schema(chunk.reset_index(drop=True), schema)
+        if carry is not None and len(carry):
+            n_rows += len(carry)
+            yield table_schema.apply_schema(carry.reset_index(drop=True), schema)
+
+    print(f"Loaded {n_rows} rows in chunks: {start_date_str} to {end_date_str}")
+
+
+def date_range_expr(start_date_str, end_date_str):
+    """
+    (년, 월, 일)이 [시작일, 종료일] 안에 있는 행을 고르는 pyarrow 필터 식
+    (년/월 조건은 파티션 디렉터리 단위로 걸러진다)
+    """
+    import pyarrow.dataset as ds
+
+    year, month, day = ds.field('년'), ds.field('월'), ds.field('일')
+
+    def on_or_after(y, m, d):
+        return (year > y) | ((year == y) & ((month > m) | ((month == m) & (day >= d))))
+
+    def on_or_before(y, m, d):
+        return (year < y) | ((year == y) & ((month < m) | ((month == m) & (day <= d))))
+
+    start = [int(x) for x in start_date_str.split('-')]
+    end = [int(x) for x in end_date_str.split('-')]
+    return on_or_after(*start) & on_or_before(*end)
+
+
+def filter_expr(filters, columns):
+    """
+    compile_filters와 같은 형식의 필터를 pyarrow 필터 식으로 변환하는 함수 (Parquet 데이터셋용)
+    """
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    if not filters:
+        return None
+    unknown = [col for col in filters if col not in columns]
+    if unknown:
+        raise ValueError(f"데이터셋에 없는 필터 컬럼: {unknown}")
+
+    compare = {'min': lambda f, v: f >= v, 'max': lambda f, v: f <= v,
+               'gt': lambda f, v: f > v, 'lt': lambda f, v: f < v}
+    exprs = []
+    for col, spec in filters.items():
+        field = ds.field(col)
+        if isinstance(spec, dict):
+            for op, value in spec.items():
+                if op in compare:
+                    exprs.append(compare[op](field, value))
+                elif op == 'in':
+                    exprs.append(field.isin(list(value)))
+                elif op == 'like':
+                    exprs.append(pc.match_like(field, value))
+                elif op == 'prefix':
+                    prefixes = [value] if isinstance(value, str) else list(value)
+                    prefix_exprs = [pc.starts_with(field, prefix) for prefix in prefixes]
+                    exprs.append(functools.reduce(operator.or_, prefix_exprs) if prefix_exprs else ds.scalar(False))
+                else:
+                    raise ValueError(f"알 수 없는 필터 연산자: {col} {op}")
+        elif isinstance(spec, (list, tuple, set)):
+            exprs.append(field.isin(list(spec)))
+        else:
+            exprs.append(field == spec)
+    return functools.reduce(operator.and_, exprs)
+
+
+def load_election_parquet(election_list, dataset_path, start_date=None, end_date=None, columns=None, filters=None):
+    """
+    parquet_export.export_parquet로 만든 년/월 파티션 데이터셋에서 선거별 거래 데이터를 불러오는 함수
+
+    조회 기간 밖의 년/월 파티션은 읽지 않고 (파티션 pruning), columns가 주어지면 해당 컬럼만
+    읽는다. filters는 pyarrow 필터 식으로 변환해 읽을 때 적용한다.
+    반환값은 load_election_data와 같다 (pyarrow 필요).
+
+    Parameters:
+        dataset_path (str): 테이블 데이터셋 경로 (예: 'data/parquet/apt_raw')
+    """
+    try:
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError("Parquet 데이터셋을 읽으려면 pyarrow가 필요합니다 (pip install pyarrow)") from e
+
+    dataset = ds.dataset(dataset_path, format='parquet', partitioning='hive')
+    schema = table_schema.get_schema(columns)
+    read_columns = None if schema is None else [col for col in [table_schema.ROW_FP, *schema] if col in dataset.schema.names]
+    row_filter = filter_expr(filters, dataset.schema.names)
+
+    election_dataframes = {}
+    for election_name, election_date in election_list.items():
+        start_date_str, end_date_str = get_election_window(election_date, start_date, end_date)
+        date_filter = date_range_expr(start_date_str, end_date_str)
+        table = dataset.to_table(columns=read_columns,
+                                 filter=date_filter if row_filter is None else date_filter & row_filter)
+        sort_keys = [(col, 'ascending') for col in ['년', '월', '일'] if col in table.column_names]
+        df = (table.sort_by(sort_keys) if sort_keys else table).to_pandas()
+        df = table_schema.apply_schema(df, schema)
+        election_dataframes[election_name] = df
+        print(f"Loaded {df.shape[0]} rows for {election_name}: {start_date_str} to {end_date_str}")
+
+    return election_dataframes
+
+
+def load_election_windows(election_list, db_path, table_name, start_date=None, end_date=None, columns=None, filters=None):
+    """
+    모든 선거의 조회 기간을 한 번의 쿼리로 불러오는 함수
+
+    선거별 기간을 겹치는 구간끼리 합친 뒤 하나의 쿼리로 읽으므로, 같은 기간
+    (사용자 지정 start_date/end_date)을 선거마다 다시 읽지 않는다. columns, filters는 load_election_data와 같다.
+
+    Returns:
+        tuple: (거래 데이터 DataFrame, {선거 이름: (시작일, 종료일)} 기간 딕셔너리)
+    """
+    windows = {name: get_election_window(date, start_date, end_date) for name, date in election_list.items()}
+
+    # 겹치거나 맞닿은 기간 병합
+    from datetime import date, timedelta
+    merged = []
+    for start, end in sorted(windows.values()):
+        if merged and date.fromisoformat(start) <= date.fromisoformat(merged[-1][1]) + timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    with db_pool.connect(db_path) as conn:
+        schema = table_schema.get_schema(columns)
+        select = table_schema.select_clause(schema, table_columns(conn, table_name))
+        where, params, order_by = build_date_filter(conn, table_name, merged, filters)
+        query = f'''
+        SELECT {select}
+        FROM {table_name}
+        WHERE {where}
+        {dedupe_clause(conn, table_name)}
+        ORDER BY {order_by}
+        '''
+        df = table_schema.apply_schema(pd.read_sql_query(query, conn, params=params), schema)
+
+    print(f"Loaded {df.shape[0]} rows for {len(windows)} elections: {merged}")
+    return df, windows
+
 # db_path = 'data/raw/RealEstate.db'
 # loader = DataLoader(db_path)
 # loader.load_data('apt_raw')
\ No newline at end of file
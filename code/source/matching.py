@@ -1,27 +1,18 @@
 import pandas as pd
-import PublicDataReader as pdr
+from source import code_tables
 
 class Matcher:
     def __init__(self, data) :
         self.data = data
-        self.conn_code = pdr.code_hdong_bdong()
-        self.code_hdong = pdr.code_hdong()
-        self.code_bdong = pdr.code_bdong()
+        # 코드표는 프로세스당 한 번 로컬 스냅샷에서 로드 (생성일자/말소일자는 이미 날짜로 변환됨)
+        self.conn_code = code_tables.code_hdong_bdong()
+        self.code_hdong = code_tables.code_hdong()
+        self.code_bdong = code_tables.code_bdong()
 
-        self.conn_code['생성일자'] = pd.to_datetime(self.conn_code['생성일자'], format='%Y%m%d', errors='coerce')
-        self.conn_code['말소일자'] = pd.to_datetime(self.conn_code['말소일자'], format='%Y%m%d', errors='coerce')
         self.conn_code['말소일자'] = self.conn_code['말소일자'].fillna(pd.Timestamp.max)
-
-        
-        self.code_hdong['생성일자'] = pd.to_datetime(self.code_hdong['생성일자'], format='%Y%m%d', errors='coerce')
-        self.code_hdong['말소일자'] = pd.to_datetime(self.code_hdong['말소일자'], format='%Y%m%d', errors='coerce')
         self.code_hdong['말소일자'] = self.code_hdong['말소일자'].fillna(pd.Timestamp.max)
 
         self.election_df = pd.read_excel("data/raw/국회의원_지역구_읍면동_경계_13_21.xlsx")
-
-        
-        self.code_bdong['생성일자'] = pd.to_datetime(self.code_bdong['생성일자'], format = '%Y%m%d')
-        self.code_bdong['말소일자'] = pd.to_datetime(self.code_bdong['말소일자'], format = '%Y%m%d')
     def bdong2hdong(self):
         matched_data = pd.merge(self.data,
                                 self.conn_code[["법정동코드", "행정동코드", "생성일자", "말소일자"]],
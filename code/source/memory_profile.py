@@ -0,0 +1,160 @@
+import sys
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows에는 resource 모듈이 없음
+    resource = None
+
+# 전체 모드에서 선거 한 건이 원본 대비 차지하는 대략적인 배수
+# (전처리 결과, raw_data/data_mapped 복사본, 행정동/선거구 merge 결과)
+FULL_MODE_FACTOR = 5
+
+
+def peak_rss_mb():
+    """
+    프로세스 시작 이후 최대 RSS (MB, resource 모듈이 없으면 None)
+
+    ru_maxrss는 Linux에서 KB, macOS에서 바이트 단위다.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def _proc_status_mb(field):
+    # /proc/self/status의 VmHWM/VmRSS (kB) -> MB, 없으면 None
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(f'{field}:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss():
+    """
+    Linux의 최대 RSS(VmHWM)를 현재 RSS로 되돌리는 함수 (/proc/self/clear_refs에 5 기록, 실패하면 False)
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def current_rss_mb():
+    """
+    현재 RSS (MB, /proc 또는 psutil이 없으면 None)
+    """
+    rss = _proc_status_mb('VmRSS')
+    if rss is not None:
+        return rss
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / (1 << 20)
+
+
+class _RssSampler(threading.Thread):
+    """
+    단계가 진행되는 동안 현재 RSS를 주기적으로 읽어 최댓값을 기록하는 스레드
+    """
+
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss_mb() or 0.0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, current_rss_mb() or 0.0)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, current_rss_mb() or 0.0)
+        return self.peak
+
+
+def frame_mb(df):
+    """
+    데이터프레임의 메모리 사용량 (MB, 문자열 포함)
+    """
+    return df.memory_usage(deep=True).sum() / (1 << 20)
+
+
+def needs_lean_mode(df, memory_budget_mb, factor=FULL_MODE_FACTOR):
+    """
+    전체 모드의 예상 사용량(원본 크기 x factor)이 메모리 예산을 넘는지 여부
+    """
+    if memory_budget_mb is None:
+        return False
+    estimate = frame_mb(df) * factor
+    if estimate > memory_budget_mb:
+        logging.info(f"예상 사용량 {estimate:,.0f}MB > 예산 {memory_budget_mb:,.0f}MB: 중간 결과를 남기지 않는 모드로 처리")
+        return True
+    return False
+
+
+class StageTracker:
+    """
+    단계별 소요 시간과 최대 RSS를 기록하는 클래스
+
+    사용 예시:
+        tracker = StageTracker('제21대 국회의원선거', memory_budget_mb=8000)
+        with tracker.stage('전처리'):
+            ...
+        tracker.report()  # 단계, 소요시간(초), 최대RSS(MB) 데이터프레임
+
+    최대 RSS는 그 단계가 진행되는 동안의 프로세스 최댓값이다. Linux에서는 단계 시작 시
+    VmHWM을 되돌리고(/proc/self/clear_refs) 끝날 때 VmHWM을 읽는다. 그럴 수 없으면
+    현재 RSS를 sample_interval초마다 읽는 스레드로 재고, 현재 RSS도 읽을 수 없으면 (psutil 미설치 등)
+    프로세스 전체 최댓값(ru_maxrss)으로 대신한다. memory_budget_mb를 넘으면 경고를 남긴다.
+    """
+
+    def __init__(self, name, memory_budget_mb=None, sample_interval=0.05):
+        self.name = name
+        self.memory_budget_mb = memory_budget_mb
+        self.sample_interval = sample_interval
+        self.records = []
+
+    @contextmanager
+    def stage(self, stage_name):
+        sampler = None
+        use_hwm = reset_peak_rss() and _proc_status_mb('VmHWM') is not None
+        if not use_hwm and current_rss_mb() is not None:
+            sampler = _RssSampler(self.sample_interval)
+            sampler.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if use_hwm:
+                peak = _proc_status_mb('VmHWM')
+            elif sampler is not None:
+                peak = sampler.stop()
+            else:
+                peak = peak_rss_mb()
+            self.records.append({'단계': stage_name, '소요시간(초)': round(elapsed, 3), '최대RSS(MB)': peak})
+            if peak is None:
+                logging.info(f"[{self.name}] {stage_name}: {elapsed:.2f}초")
+            else:
+                logging.info(f"[{self.name}] {stage_name}: {elapsed:.2f}초, 최대 RSS {peak:,.0f}MB")
+                if self.memory_budget_mb is not None and peak > self.memory_budget_mb:
+                    logging.warning(f"[{self.name}] {stage_name}: 최대 RSS {peak:,.0f}MB가 예산 {self.memory_budget_mb:,.0f}MB를 넘음")
+
+    def report(self):
+        return pd.DataFrame(self.records, columns=['단계', '소요시간(초)', '최대RSS(MB)'])
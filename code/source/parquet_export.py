@@ -0,0 +1,87 @@
+import sqlite3
+import logging
+
+import pandas as pd
+
+from source import schema as table_schema
+
+logging.basicConfig(level=logging.INFO)
+
+# 파티션 컬럼 (년=YYYY/월=M 디렉터리)
+PARTITION_COLS = ['년', '월']
+
+
+def export_schema(columns):
+    """
+    테이블 전체 컬럼의 내보내기 스키마 (TABLE_SCHEMAS에 있는 컬럼은 그 타입, 행 지문은 64비트 정수, 나머지는 문자열)
+    """
+    kinds = dict(table_schema.COLUMN_KINDS, **{table_schema.ROW_FP: 'int64'})
+    return {col: kinds.get(col, 'string') for col in columns}
+
+
+def to_export_frame(df, schema):
+    """
+    청크마다 같은 Arrow 스키마가 되도록 정수 컬럼은 결측 허용 정수(Int32/Int16)로 변환
+    """
+    for col, kind in schema.items():
+        if kind in ('amount', 'int'):
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int32' if kind == 'amount' else 'Int16')
+        elif kind == 'float':
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        elif kind == 'int64':
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
+        else:
+            df[col] = df[col].astype(table_schema.STRING_DTYPE)
+    return df
+
+
+def export_parquet(db_path, out_dir='data/parquet', tables=('apt_raw', 'apt_lease_raw'), chunksize=500_000):
+    """
+    SQLite 거래 테이블을 년/월 파티션 Parquet 데이터셋으로 내보내는 함수
+
+    - {out_dir}/{table}/년=YYYY/월=M/part-*.parquet (hive 파티션)
+    - 금액은 쉼표를 제거한 정수, 년/월/일은 정수, 전용면적은 float64, 나머지는 문자열
+    - 테이블을 chunksize 행씩 읽어 쓰므로 메모리 사용량이 테이블 크기와 무관
+    - 다시 실행하면 테이블 디렉터리를 새로 만든다
+
+    load_data.load_election_parquet로 읽는다 (pyarrow 필요).
+    """
+    import shutil
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    conn = sqlite3.connect(db_path)
+    try:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table in tables:
+            if table not in existing:
+                logging.warning(f"테이블이 없어 건너뜀: {table}")
+                continue
+
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})") if row[1] != 'deal_ymd']
+            schema = export_schema(columns)
+            select = table_schema.select_clause(schema, columns)
+            target = f"{out_dir}/{table}"
+            shutil.rmtree(target, ignore_errors=True)
+
+            arrow_schema = None
+            n_rows = 0
+            for i, chunk in enumerate(pd.read_sql_query(f"SELECT {select} FROM {table}", conn, chunksize=chunksize)):
+                batch = pa.Table.from_pandas(to_export_frame(chunk, schema), schema=arrow_schema, preserve_index=False)
+                arrow_schema = batch.schema
+                ds.write_dataset(
+                    batch, target, format='parquet',
+                    partitioning=ds.partitioning(batch.select(PARTITION_COLS).schema, flavor='hive'),
+                    basename_template=f'part-{i}-{{i}}.parquet',
+                    existing_data_behavior='overwrite_or_ignore',
+                )
+                n_rows += batch.num_rows
+                logging.info(f"{table}: {n_rows}행 내보냄")
+            logging.info(f"{table}: Parquet 내보내기 완료 ({target})")
+    finally:
+        conn.close()
+
+
+# 사용 예시
+if __name__ == "__main__":
+    export_parquet("data/raw/RealEstate_optimized.db")
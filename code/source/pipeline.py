@@ -0,0 +1,96 @@
+import queue
+import logging
+import threading
+
+_DONE = object()
+
+
+def run_pipelined(items, load, process, save, max_in_flight=3):
+    """
+    load -> process -> save 세 단계를 항목별로 겹쳐 실행하는 함수
+
+    로드는 백그라운드 스레드, 처리(전처리/지니계수)는 호출한 스레드, 저장은 또 다른
+    백그라운드 스레드에서 실행한다. 항목 k를 처리하는 동안 k+1을 로드하고 k-1을 저장한다.
+    로드를 시작할 때 자리를 잡고 저장이 끝나면 반납하므로 동시에 메모리에 있는 항목은
+    최대 max_in_flight개다. 어느 단계에서든 예외가 나면 나머지를 멈추고 그 예외를 다시 발생시킨다.
+
+    Parameters:
+        items (list): 처리할 항목 (예: (선거 이름, 선거 날짜))
+        load (callable): load(item) -> 로드 결과
+        process (callable): process(item, loaded) -> 처리 결과 (None이면 저장하지 않음)
+        save (callable): save(item, processed)
+        max_in_flight (int): 동시에 메모리에 있는 최대 항목 수
+
+    Returns:
+        list: 항목 순서대로의 처리 결과
+    """
+    loaded_queue = queue.Queue()
+    save_queue = queue.Queue()
+    slots = threading.Semaphore(max_in_flight)
+    stop = threading.Event()
+    errors = []
+
+    def acquire_slot():
+        while not stop.is_set():
+            if slots.acquire(timeout=0.1):
+                return True
+        return False
+
+    def loader():
+        try:
+            for item in items:
+                if not acquire_slot():
+                    break
+                logging.info(f"[파이프라인] 로드 시작: {item}")
+                loaded_queue.put((item, load(item)))
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            loaded_queue.put(_DONE)
+
+    def saver():
+        while True:
+            entry = save_queue.get()
+            if entry is _DONE:
+                return
+            item, processed = entry
+            try:
+                if not stop.is_set():
+                    logging.info(f"[파이프라인] 저장 시작: {item}")
+                    save(item, processed)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                slots.release()
+
+    threads = [threading.Thread(target=loader, daemon=True), threading.Thread(target=saver, daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    outputs = []
+    try:
+        while not stop.is_set():
+            entry = loaded_queue.get()
+            if entry is _DONE:
+                break
+            item, loaded = entry
+            processed = process(item, loaded)
+            del entry, loaded
+            outputs.append(processed)
+            if processed is None:
+                slots.release()
+            else:
+                save_queue.put((item, processed))
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        save_queue.put(_DONE)
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+    return outputs
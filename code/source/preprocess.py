@@ -1,6 +1,7 @@
+import time
+import logging
 import pandas as pd
-import numpy as np
-import PublicDataReader as pdr
+from source import code_tables, conversion_rate, schema as table_schema
 
 class DataProcessor:
     def __init__(self, data):
@@ -12,12 +13,23 @@ class DataProcessor:
         print(f"요약 통계량 : {self.data.describe()}")
 
 
-    def preprocessing(self):
+    def preprocessing(self, copy=True):
+        """
+        copy=False면 원본을 복사하지 않고 그대로 가공한다 (원본 데이터프레임이 바뀌므로
+        호출한 쪽에서 원본을 더 쓰지 않을 때만 사용)
+        """
+        start = time.perf_counter()
         # Create a copy of the original DataFrame
-        data_copy = self.data.copy()
+        data_copy = self.data.copy() if copy else self.data
 
-        # 중복 행 제거
-        data_copy.drop_duplicates(inplace = True)
+        # 중복 행 제거 (행 지문이 있으면 정수 컬럼 하나로 비교하고 지문 컬럼은 제거)
+        row_fp = table_schema.ROW_FP
+        if row_fp in data_copy.columns and data_copy[row_fp].notna().all():
+            data_copy.drop_duplicates(subset = [row_fp], inplace = True)
+        else:
+            data_copy.drop_duplicates(subset = [col for col in data_copy.columns if col != row_fp], inplace = True)
+        if row_fp in data_copy.columns:
+            data_copy.drop(columns = [row_fp], inplace = True)
 
         # 결측값이 많은 칼럼 제거
         threshold = len(data_copy) * 0.5
@@ -29,34 +41,24 @@ class DataProcessor:
         for col in drop_cols :
             if col in data_copy.columns : data_copy.drop(columns = [col], inplace = True)
 
-        # 거래일자 칼럼 생성 (강건성 보강)
-        for col in ['년', '월', '일']:
-            if col in data_copy.columns:
-                data_copy[col] = pd.to_numeric(data_copy[col], errors='coerce')
-        # 일 결측은 1일로 보정
+        # 선언적 스키마(schema.TABLE_SCHEMAS)로 한 번에 타입 변환
+        # (금액은 쉼표 제거 후 int32, 년/월/일은 정수, 전용면적은 실수, 코드/이름은 문자열)
+        is_lease = {'보증금액', '월세금액'}.issubset(set(data_copy.columns))
+        data_copy = table_schema.apply_schema(data_copy, table_schema.TABLE_SCHEMAS['lease' if is_lease else 'sale'])
+
+        # 거래일자 칼럼 생성: 년 * 10000 + 월 * 100 + 일 (일 결측은 1일로 보정)
         if '일' in data_copy.columns:
             data_copy['일'] = data_copy['일'].fillna(1)
-        try:
-            data_copy["거래일자"] = pd.to_datetime(
-                data_copy[['년', '월', '일']].astype(int).astype(str).agg('-'.join, axis=1),
-                errors='coerce'
-            )
-        except Exception:
-            # fallback: 매핑 방식
-            if set(['년','월','일']).issubset(data_copy.columns):
-                data_copy["거래일자"] = pd.to_datetime(
-                    {
-                        'year': data_copy['년'].astype('Int64').fillna(2000),
-                        'month': data_copy['월'].astype('Int64').fillna(1),
-                        'day': data_copy['일'].astype('Int64').fillna(1)
-                    }, errors='coerce'
-                )
-            else:
-                # 최후 수단: 전부 NaT
-                data_copy["거래일자"] = pd.NaT
+        if {'년', '월', '일'}.issubset(data_copy.columns):
+            data_copy["거래일자"] = table_schema.parse_ymd(data_copy['년'], data_copy['월'], data_copy['일'])
+        else:
+            data_copy["거래일자"] = pd.NaT
+
+        elapsed = time.perf_counter() - start
+        logging.info(f"전처리 파싱: {len(data_copy):,}행, {elapsed:.2f}초 ({len(data_copy) / max(elapsed, 1e-9):,.0f}행/초)")
 
         # 전월세 데이터(보증금액/월세금액 존재)의 표준화 처리
-        if {'보증금액', '월세금액'}.issubset(set(data_copy.columns)):
+        if is_lease:
             data_copy = self._preprocess_lease(data_copy)
         else:
             # 매매 데이터 처리
@@ -65,11 +67,7 @@ class DataProcessor:
         return data_copy
 
     def _preprocess_sale(self, df: pd.DataFrame) -> pd.DataFrame:
-        # 데이터 타입 변경 (매매)
-        if '거래금액' in df.columns and df["거래금액"].dtype == 'object':
-            if df["거래금액"].str.contains(",").any():
-                df["거래금액"] = df["거래금액"].str.replace(",", "", regex=False).astype(int)
-
+        # 거래금액은 preprocessing에서 정수로 변환됨
         if '전용면적' in df.columns:
             df["전용면적"] = df["전용면적"].astype(float)
 
@@ -81,16 +79,12 @@ class DataProcessor:
         return df
 
     def _preprocess_lease(self, df: pd.DataFrame) -> pd.DataFrame:
-        # 금액 컬럼 클린업
+        # 금액 컬럼 클린업 (preprocessing에서 숫자로 변환됨, 빈 값은 0)
         for col in ["보증금액", "월세금액"]:
-            if df[col].dtype == 'object':
-                df[col] = df[col].str.replace(",", "", regex=False).replace("", "0").astype(int)
-            else:
-                df[col] = df[col].fillna(0).astype(int)
-
-        # 시군구코드 → 시도명 매핑 준비 (타입/포맷 정규화)
-        code_bdong = pdr.code_bdong()[["시도명", "시군구코드", "동리명", "법정동코드"]].copy()
-        code_bdong['시군구코드'] = code_bdong['시군구코드'].astype(str).str.zfill(5)
+            df[col] = df[col].fillna(0).astype(int)
+
+        # 시군구코드 → 시도명 매핑 준비 (시군구코드는 코드표 레지스트리에서 5자리로 정규화됨)
+        code_bdong = code_tables.code_bdong()[["시도명", "시군구코드", "동리명", "법정동코드"]].copy()
         code_bdong['동리명'] = code_bdong['동리명'].astype(str).str.strip()
         code_bdong.drop_duplicates(subset=["시군구코드", "동리명"], inplace=True)
 
@@ -113,30 +107,6 @@ class DataProcessor:
                 df['시도명'] = df['시도명'].fillna(df['시도명_sido'])
                 df.drop(columns=['시도명_sido'], inplace=True)
 
-        # 전환율 로드 및 롱 포맷 변환
-        rate_df = pd.read_csv('data/mapping/지역별_전월셰_전환율_2011_2025.csv')
-        rate_df = rate_df[rate_df['주택유형별(1)'] == '아파트'].copy()
-        rate_long = rate_df.melt(
-            id_vars=['주택유형별(1)', '지역별(1)'],
-            var_name='연월', value_name='전환율'
-        )
-        # 전환율 숫자화 및 지역/연월 키 생성
-        rate_long['전환율'] = pd.to_numeric(rate_long['전환율'], errors='coerce')
-        # 지역명 정규화 (양쪽 공백 제거)
-        rate_long['지역'] = rate_long['지역별(1)'].astype(str).str.strip()
-        rate_long['연월'] = rate_long['연월'].astype(str)
-        rate_long = rate_long[['지역', '연월', '전환율']]
-
-        # 보간: 같은 지역 내에서 시간 순으로 결측 채우기
-        rate_long['연'] = rate_long['연월'].str.slice(0, 4).astype(int, errors='ignore')
-        rate_long['월'] = rate_long['연월'].str.slice(5, 7)
-        rate_long['월'] = pd.to_numeric(rate_long['월'], errors='coerce')
-        rate_long.sort_values(['지역', '연', '월'], inplace=True)
-        rate_long['전환율'] = rate_long.groupby('지역')['전환율'].transform(lambda s: s.ffill().bfill())
-
-        # 전국 백업 키 준비
-        nat_map = rate_long[rate_long['지역'] == '전국'].set_index(['연월'])['전환율']
-
         # 거래별 연월 키
         df['연'] = df['거래일자'].dt.year.astype(int)
         df['월_2'] = df['거래일자'].dt.month.astype(int)
@@ -145,15 +115,10 @@ class DataProcessor:
         df['지역키'] = df['시도명'].astype(str).str.strip()
         df['지역키'] = df['지역키'].where(df['지역키'].isin(allowed_provinces), '전국')
 
-        # 전환율 매핑
-        rate_pivot = rate_long.set_index(['지역', '연월'])['전환율']
-        df['전환율'] = df.apply(
-            lambda r: rate_pivot.get((r['지역키'], r['연월']), np.nan), axis=1
-        )
-        # 결측은 전국치로 대체
-        df['전환율'] = df.apply(
-            lambda r: nat_map.get(r['연월'], np.nan) if pd.isna(r['전환율']) else r['전환율'], axis=1
-        )
+        # 전환율 매핑: (지역 x 연월) 배열에서 한 번에 조회, 결측은 전국치로 대체
+        # (배열은 CSV가 바뀔 때만 다시 만들고 프로세스 안에서 공유, conversion_rate 참조)
+        rate_table = conversion_rate.load_rate_table()
+        df['전환율'] = rate_table.lookup(df['지역키'], df['연월'])
 
         # 전세환산 보증금 계산: 보증금 + (월세*12) * 100 / 전환율
         df['거래금액'] = df['보증금액'] + (df['월세금액'] * 12 * 100 / df['전환율']).round().astype(int)
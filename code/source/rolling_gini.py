@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import logging
+
+
+def _fenwick_prefix(tree, offset, i):
+    # 지역 구간 [offset+1, offset+size] 안에서 순위 1..i 까지의 누적값
+    total = 0
+    while i > 0:
+        total += tree[offset + i]
+        i -= i & (-i)
+    return total
+
+
+def _fenwick_add(tree, offset, size, i, delta):
+    while i <= size:
+        tree[offset + i] += delta
+        i += i & (-i)
+
+
+def rolling_gini(data, region_col, value_col='거래금액', window_days=365, freq='D',
+                 start_date=None, end_date=None, date_col='거래일자'):
+    """
+    지역별 '최근 window_days일' 지니계수 시계열을 한 번의 시간순 스캔으로 계산하는 함수
+
+    지역마다 가격 순위 기반 Fenwick 트리(건수/합계)를 두고, 거래를 시간순으로 삽입하고
+    창을 벗어난 거래를 제거하면서 sum(i * x_(i))를 갱신한다. 기준일마다 모든 지역의
+    지니계수를 GiniCalculator.gini와 같은 식으로 계산한다.
+
+    Parameters:
+        data (pd.DataFrame): region_col, value_col, date_col을 포함하는 거래 데이터
+        region_col (str): 지역 컬럼
+        value_col (str): 값 컬럼 (음수 불가)
+        window_days (int): 창 길이 (기준일 t에 대해 (t - window_days, t] 구간)
+        freq (str): 기준일 간격 ('D' 일별, 'MS'/'ME' 등 pandas 주기 문자열)
+        start_date, end_date: 첫/마지막 기준일 (기본값은 데이터의 첫/마지막 거래일)
+        date_col (str): 거래일자 컬럼
+
+    Returns:
+        pd.DataFrame: region_col, 기준일자, 거래수, 지니계수 (long format)
+    """
+    df = data[[region_col, value_col, date_col]].dropna()
+    if (df[value_col] < 0).any():
+        raise ValueError(f"롤링 지니계수는 음수 값을 지원하지 않습니다: {value_col}")
+
+    codes, labels = pd.factorize(df[region_col], sort=True)
+    n_regions = len(labels)
+    values = df[value_col].to_numpy()
+    dates = df[date_col].to_numpy(dtype='datetime64[ns]')
+
+    # 지역 내 가격 순위(1..m)와 지역별 트리 오프셋
+    dense_rank = pd.Series(values).groupby(codes).rank(method='dense').to_numpy(dtype=np.int64)
+    sizes = pd.Series(dense_rank).groupby(codes).max().reindex(range(n_regions), fill_value=0).to_numpy(dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(sizes + 1)[:-1]))
+
+    start_date = pd.Timestamp(start_date) if start_date is not None else pd.Timestamp(dates.min())
+    end_date = pd.Timestamp(end_date) if end_date is not None else pd.Timestamp(dates.max())
+    eval_dates = pd.date_range(start_date, end_date, freq=freq)
+    window = np.timedelta64(window_days, 'D')
+    logging.info(f"롤링 지니계수 계산 시작 - 지역 {n_regions}개, 기준일 {len(eval_dates)}개, 창 {window_days}일")
+
+    # 시간순 정렬 (삽입/제거 포인터가 공유)
+    order = np.argsort(dates, kind='stable')
+    dates = dates[order]
+    ev_code = codes[order].tolist()
+    ev_rank = dense_rank[order].tolist()
+    ev_value = values[order].tolist()  # 정수 가격은 파이썬 int로 누적해 오차 없음
+    ev_offset = offsets[codes[order]].tolist()
+    ev_size = sizes[codes[order]].tolist()
+
+    size_total = int(offsets[-1] + sizes[-1] + 1) if n_regions else 0
+    tree_cnt = [0] * size_total
+    tree_sum = [0] * size_total
+    cnt = [0] * n_regions
+    total = [0] * n_regions
+    rank_sum = [0] * n_regions  # sum(i * x_(i))
+
+    ins = rem = 0
+    n_events = len(ev_code)
+    frames = []
+    for t in eval_dates.to_numpy(dtype='datetime64[ns]'):
+        # 기준일까지의 거래 삽입
+        while ins < n_events and dates[ins] <= t:
+            g, r, v, o, m = ev_code[ins], ev_rank[ins], ev_value[ins], ev_offset[ins], ev_size[ins]
+            le = _fenwick_prefix(tree_cnt, o, r)
+            gt_sum = total[g] - _fenwick_prefix(tree_sum, o, r)
+            rank_sum[g] += (le + 1) * v + gt_sum
+            _fenwick_add(tree_cnt, o, m, r, 1)
+            _fenwick_add(tree_sum, o, m, r, v)
+            cnt[g] += 1
+            total[g] += v
+            ins += 1
+        # 창을 벗어난 거래 제거 (같은 값 중 마지막 순위의 거래를 제거)
+        while rem < ins and dates[rem] <= t - window:
+            g, r, v, o, m = ev_code[rem], ev_rank[rem], ev_value[rem], ev_offset[rem], ev_size[rem]
+            le = _fenwick_prefix(tree_cnt, o, r)
+            gt_sum = total[g] - _fenwick_prefix(tree_sum, o, r)
+            rank_sum[g] -= le * v + gt_sum
+            _fenwick_add(tree_cnt, o, m, r, -1)
+            _fenwick_add(tree_sum, o, m, r, -v)
+            cnt[g] -= 1
+            total[g] -= v
+            rem += 1
+
+        n = np.array(cnt, dtype=float)
+        s = np.array(total, dtype=float)
+        a = np.array(rank_sum, dtype=float)
+        # sum((2i - n - 1) * (x + 1e-7)) / (n * sum(x + 1e-7)), 분자의 0 방지 항은 상쇄됨
+        with np.errstate(invalid='ignore', divide='ignore'):
+            gini = (2 * a - (n + 1) * s) / (n * (s + n * 0.0000001))
+        frames.append(pd.DataFrame({
+            region_col: labels,
+            '기준일자': pd.Timestamp(t),
+            '거래수': n.astype(np.int64),
+            '지니계수': np.where(n > 0, gini, np.nan),
+        }))
+
+    result = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=[region_col, '기준일자', '거래수', '지니계수'])
+    logging.info(f"롤링 지니계수 계산 완료: {result.shape}")
+    return result
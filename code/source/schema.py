@@ -0,0 +1,145 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 (문자열 컬럼을 Arrow 기반으로 저장)
+    STRING_DTYPE = pd.StringDtype('pyarrow')
+except ImportError:
+    STRING_DTYPE = pd.StringDtype()
+
+# 거래 유형별 조회 컬럼과 타입
+#   amount : 쉼표를 SQL에서 제거한 금액 -> int32
+#   int    : 년/월/일 같은 작은 정수 -> int16
+#   float  : 전용면적 -> float64 (평당 금액이 원본 텍스트를 float64로 읽은 값과 같도록)
+#   string : 코드/이름 -> (Arrow 기반) string
+# 중복 제거 기준이 유지되도록 거래를 구분하는 컬럼(아파트, 지번, 층, 일련번호 등)도 포함한다.
+# 테이블에 없는 컬럼은 조회에서 제외된다.
+TABLE_SCHEMAS = {
+    'sale': {
+        '지역코드': 'string',
+        '법정동': 'string',
+        '법정동시군구코드': 'string',
+        '법정동읍면동코드': 'string',
+        '아파트': 'string',
+        '지번': 'string',
+        '일련번호': 'string',
+        '층': 'string',
+        '전용면적': 'float',
+        '거래금액': 'amount',
+        '년': 'int',
+        '월': 'int',
+        '일': 'int',
+    },
+    'lease': {
+        '지역코드': 'string',
+        '법정동': 'string',
+        '아파트': 'string',
+        '지번': 'string',
+        '층': 'string',
+        '전용면적': 'float',
+        '보증금액': 'amount',
+        '월세금액': 'amount',
+        '년': 'int',
+        '월': 'int',
+        '일': 'int',
+    },
+}
+
+
+# 행 지문 컬럼 (db_migration.add_row_fp가 원본 행 전체로 계산한 64비트 정수, 중복 제거 키)
+ROW_FP = 'row_fp'
+
+# 컬럼 -> 타입 (모든 거래 유형 통합, 필터/내보내기에서 사용)
+COLUMN_KINDS = {col: kind for schema in TABLE_SCHEMAS.values() for col, kind in schema.items()}
+
+
+def get_schema(columns):
+    """
+    'sale'/'lease' 이름 또는 {컬럼: 타입} 딕셔너리를 스키마로 변환 (None이면 전체 컬럼)
+    """
+    if columns is None or isinstance(columns, dict):
+        return columns
+    if columns not in TABLE_SCHEMAS:
+        raise ValueError(f"알 수 없는 컬럼 스키마: {columns}")
+    return TABLE_SCHEMAS[columns]
+
+
+def numeric_expr(col):
+    """
+    SQLite 문자열 컬럼을 숫자로 비교하기 위한 SQL 식 (금액은 쉼표 제거 후 정수, 나머지 숫자는 실수)
+    """
+    kind = COLUMN_KINDS.get(col, 'string')
+    if kind == 'amount':
+        return f"CAST(REPLACE({col}, ',', '') AS INTEGER)"
+    if kind in ('int', 'float'):
+        return f"CAST({col} AS REAL)"
+    return col
+
+
+def select_clause(schema, table_columns):
+    """
+    스키마로 SELECT 목록을 만드는 함수 (금액의 쉼표 제거와 정수 변환은 SQLite에서 수행)
+    테이블에 행 지문(row_fp)이 있으면 중복 제거용으로 함께 조회한다.
+    """
+    if schema is None:
+        return '*'
+    exprs = [ROW_FP] if ROW_FP in table_columns and ROW_FP not in schema else []
+    for col, kind in schema.items():
+        if col not in table_columns:
+            continue
+        if kind == 'amount':
+            # 빈 문자열은 0 (전월세 전처리와 동일)
+            exprs.append(f"CAST(REPLACE(IFNULL({col}, ''), ',', '') AS INTEGER) AS {col}")
+        elif kind == 'int':
+            exprs.append(f"CAST(NULLIF({col}, '') AS INTEGER) AS {col}")
+        else:
+            exprs.append(col)
+    missing = [col for col in schema if col not in table_columns]
+    if missing:
+        logging.info(f"테이블에 없는 스키마 컬럼 제외: {missing}")
+    return ', '.join(exprs)
+
+
+def apply_schema(df, schema):
+    """
+    조회 결과를 스키마 타입으로 변환 (정수 컬럼에 결측이 있으면 실수형 유지)
+    SQL에서 정리되지 않은 문자열 금액은 쉼표를 제거한 뒤 변환한다.
+    """
+    if schema is None:
+        return df
+    for col, kind in schema.items():
+        if col not in df.columns:
+            continue
+        if kind in ('amount', 'int'):
+            values = df[col]
+            if kind == 'amount' and not pd.api.types.is_numeric_dtype(values):
+                values = values.astype(str).str.replace(',', '', regex=False).str.strip()
+            values = pd.to_numeric(values, errors='coerce')
+            if values.notna().all():
+                df[col] = values.astype(np.int32 if kind == 'amount' else np.int16)
+            else:
+                df[col] = values.astype(float)
+        elif kind == 'float':
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float64)
+        else:
+            df[col] = df[col].astype(STRING_DTYPE)
+    return df
+
+
+def parse_ymd(year, month, day):
+    """
+    년/월/일 숫자 컬럼으로 거래일자를 만드는 함수
+
+    년 * 10000 + 월 * 100 + 일로 YYYYMMDD 값을 계산하고, 고유한 날짜만 '%Y%m%d'로 파싱해
+    행에 다시 배치한다 (날짜 종류는 행 수보다 훨씬 적음). 결측이나 없는 날짜는 NaT.
+    """
+    ymd = (pd.to_numeric(year, errors='coerce').to_numpy(dtype=np.float64) * 10000
+           + pd.to_numeric(month, errors='coerce').to_numpy(dtype=np.float64) * 100
+           + pd.to_numeric(day, errors='coerce').to_numpy(dtype=np.float64))
+    codes, uniques = pd.factorize(ymd)  # 결측은 -1
+    parsed = pd.to_datetime(pd.Series(uniques), format='%Y%m%d', errors='coerce').to_numpy()
+    dates = parsed[np.maximum(codes, 0)] if len(parsed) else np.full(len(codes), np.datetime64('NaT'), dtype=parsed.dtype)
+    dates[codes < 0] = np.datetime64('NaT')
+    return pd.Series(dates, index=year.index)
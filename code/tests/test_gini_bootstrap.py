@@ -0,0 +1,31 @@
+import os
+import sys
+import subprocess
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import numpy as np
+from source import gini_backends, gini_bootstrap
+
+if __name__ == "__main__":
+    gini_backends.get_backend('auto')  # Numba가 있으면 병렬 커널 검증으로 스레드 풀이 먼저 시작됨
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, 5, 2000)
+    values = rng.lognormal(10, 1, 2000)
+    ci = gini_bootstrap.bootstrap_ci(codes, values, 5, n_boot=200, seed=0, n_jobs=2)
+    serial = gini_bootstrap.bootstrap_ci(codes, values, 5, n_boot=200, seed=0, n_jobs=1)
+    assert np.allclose(ci, serial, equal_nan=True)
+    print("ok")
+"""
+
+
+def test_bootstrap_with_processes_exits_after_backend_init(tmp_path):
+    script = tmp_path / "run_bootstrap.py"
+    script.write_text(SCRIPT, encoding="utf-8")
+    env = dict(os.environ, PYTHONPATH=CODE_DIR, GINI_BACKEND="auto")
+    # 프로세스가 종료되지 않으면 timeout으로 실패
+    completed = subprocess.run([sys.executable, str(script)], cwd=CODE_DIR, env=env,
+                               capture_output=True, text=True, timeout=300)
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip().endswith("ok")